@@ -0,0 +1,21 @@
+from .panel import FIELDS, OhlcvPanel
+from .dates import DateIndex, MinuteDates, from_epoch_day, to_epoch_day
+from .trading_calendar import Schedule, TradingCalendar
+from .ingest import OhlcvIngestor
+from .store import HistoryStore
+from .views import BarView, OhlcvView
+from .lazy import AccessStats, LazyPanel
+from .aggregates import RunningMax, RunningMean, RunningMin, RunningSum, SeriesAggregate
+from .runner import BookRunner
+from .streaming import StreamingIndicator
+from .memo import IndicatorCache
+from .quantiles import RollingQuantile
+from .returns import ReturnsBank
+from .lookback import LookbackSeries
+from .averages import MovingAverageBank
+from .extremes import ExtremesTracker
+from .regression import RegressionBank
+from .roar import RoarScoreEngine
+from .kalman import KalmanBank, KalmanTrend, estimate_kalman, kalman_filter
+from .volatility import VolatilityBank, inverse_volatility_weights
+from . import cross_section, kernels, streaming, trading_calendar, volatility
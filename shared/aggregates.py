@@ -0,0 +1,113 @@
+import math
+from collections import deque
+
+import numpy as np
+
+
+def _read(source, ticker, field, row):
+    """``field`` of ``ticker`` at ``row`` of a HistoryStore or OhlcvPanel, None where the bar is missing."""
+    if not source.is_valid(ticker, row):
+        return None
+    return float(source.array(ticker)[row, source.field_index[field]])
+
+
+class RunningAggregate:
+    """
+    Unbounded statistic of one ticker field, updated one bar at a time.
+
+    Strategies that declare a ``max_lookback`` only see that many bars, so
+    statistics over the whole history (all-time peak, full-history mean)
+    are registered as running aggregates instead. ``update`` is fed every
+    bar's value; missing values (None/NaN) are skipped.
+
+    BookRunner drives aggregates through ``feed(source, row)`` and
+    ``reset()``, and hands strategies their ``value``.
+    """
+
+    def __init__(self, ticker, field="close"):
+        self.ticker = ticker
+        self.field = field
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.value = None
+
+    def feed(self, source, row):
+        return self.update(_read(source, self.ticker, self.field, row))
+
+    def update(self, x):
+        if x is None or math.isnan(x):
+            return self.value
+        self.count += 1
+        self.value = x if self.count == 1 else self._combine(x)
+        return self.value
+
+    def _combine(self, x):
+        raise NotImplementedError
+
+
+class RunningMax(RunningAggregate):
+    def _combine(self, x):
+        return x if x > self.value else self.value
+
+
+class RunningMin(RunningAggregate):
+    def _combine(self, x):
+        return x if x < self.value else self.value
+
+
+class RunningSum(RunningAggregate):
+    def _combine(self, x):
+        return self.value + x
+
+
+class RunningMean(RunningAggregate):
+    def _combine(self, x):
+        return self.value + (x - self.value) / self.count
+
+
+class SeriesAggregate:
+    """
+    Aggregate of a series derived from one ticker field, e.g. a rolling volatility.
+
+    On every bar where the ticker is present ``function`` is called with
+    its last ``window`` values of ``field`` (oldest first, once that many
+    have been seen) and the result is fed to ``aggregate``; None or NaN
+    results are skipped. Any object with ``update(x)`` and ``reset()``
+    works as ``aggregate``: a RunningMax, or ``RollingQuantile(None)`` for
+    full-history percentiles of the derived series::
+
+        vol = SeriesAggregate(RollingQuantile(None), realized_vol, "QQQ", window=61)
+        data["aggregates"]["vol"].percentile(55)
+
+    ``value`` is the aggregate's ``value``, or the aggregate itself when it
+    has none (as RollingQuantile), to be queried by the strategy.
+    """
+
+    def __init__(self, aggregate, function, ticker, field="close", window=1):
+        self.aggregate = aggregate
+        self.function = function
+        self.ticker = ticker
+        self.field = field
+        self.window = window
+        self.reset()
+
+    @property
+    def value(self):
+        return getattr(self.aggregate, "value", self.aggregate)
+
+    def reset(self):
+        self.aggregate.reset()
+        self._values = deque(maxlen=self.window)
+
+    def feed(self, source, row):
+        x = _read(source, self.ticker, self.field, row)
+        if x is None or math.isnan(x):
+            return self.value
+        self._values.append(x)
+        if len(self._values) == self.window:
+            derived = self.function(np.array(self._values))
+            if derived is not None and derived == derived:
+                self.aggregate.update(float(derived))
+        return self.value
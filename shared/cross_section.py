@@ -0,0 +1,150 @@
+import numpy as np
+
+from .ingest import OhlcvIngestor
+from .kernels import rolling_sum
+from .panel import OhlcvPanel
+
+
+def _closes(tickers, panel, field="close"):
+    """
+    (bar, ticker) float64 array of ``field`` for ``tickers``.
+
+    ``panel`` is an OhlcvPanel, an OhlcvIngestor or ``data["ohlcv"]``. A
+    ``data["ohlcv"]`` list is parsed into a new panel on every call, a Python
+    pass over bars x tickers that costs more than the indicator itself;
+    strategies calling these functions every bar should pass the panel of an
+    OhlcvIngestor fed once per bar.
+    """
+    tickers = list(tickers)
+    if isinstance(panel, OhlcvIngestor):
+        panel = panel.panel
+    elif not isinstance(panel, OhlcvPanel):
+        panel = OhlcvPanel.from_ohlcv(panel, tickers=tickers)
+    columns = [panel.ticker_index[ticker] for ticker in tickers]
+    return tickers, np.asarray(panel.field(field)[:, columns], dtype=np.float64)
+
+
+def _by_ticker(tickers, result):
+    return {ticker: result[:, i] for i, ticker in enumerate(tickers)}
+
+
+def _recurrence(p, q):
+    """
+    ``y[t] = p[t] * y[t - 1] + q[t]`` down every column, from ``y[-1] = 0``;
+    ``p`` may be a single (bar, 1) column shared by all of ``q``.
+
+    Solved as ``y = P * cumsum(q / P)``, ``P`` being the running product of
+    ``p``, over blocks of rows short enough for ``P`` to stay above e**-300;
+    a row whose ``p`` alone is below that is stepped directly.
+    """
+    out = np.empty(q.shape)
+    carry = np.zeros(q.shape[1])
+    depth = -np.cumsum(np.log(np.maximum(p.min(axis=1, initial=1.0), 1e-300)))
+    start = 0
+    while start < len(q):
+        base = depth[start - 1] if start else 0.0
+        stop = max(int(np.searchsorted(depth, base + 300, side="right")), start + 1)
+        if stop == start + 1:
+            out[start] = p[start] * carry + q[start]
+        else:
+            product = np.cumprod(p[start:stop], axis=0)
+            block = out[start:stop]
+            np.divide(q[start:stop], product, out=block)
+            np.cumsum(block, axis=0, out=block)
+            block += carry
+            block *= product
+        carry = out[stop - 1]
+        start = stop
+    return out
+
+
+def _ewm(values, alpha, adjust, min_periods=1):
+    """
+    ``ewm(alpha, adjust, min_periods).mean()`` down every column at once (see
+    streaming._Ewm), as linear recurrences solved by ``_recurrence``.
+
+    With ``adjust`` the mean is the ratio of two decaying sums, of the values
+    and of the weights, taken on rows with an observation and carried over
+    the rows between. Without it each observation mixes in with weight
+    ``alpha`` against ``(1 - alpha) ** k`` for the previous mean, ``k`` rows
+    back, as pandas does across missing values.
+    """
+    observed = ~np.isnan(values)
+    x = np.where(observed, values, 0.0)
+    rows = np.arange(len(values))[:, None]
+    last = np.maximum.accumulate(np.where(observed, rows, -1), axis=0)
+    if adjust:
+        decay = np.full((len(values), 1), 1.0 - alpha)
+        with np.errstate(invalid="ignore"):
+            ratio = _recurrence(decay, x) / _recurrence(decay, observed.astype(np.float64))
+        weighted = np.take_along_axis(ratio, np.maximum(last, 0), axis=0)
+    else:
+        previous = np.full(values.shape, -1)
+        previous[1:] = last[:-1]
+        # Weight kept by the previous mean: 1 without an observation, 0 on
+        # the first one, else old_wt / (old_wt + alpha).
+        p = (1.0 - alpha) ** (rows - previous)
+        p /= p + alpha
+        p[~observed] = 1.0
+        p[observed & (previous < 0)] = 0.0
+        weighted = _recurrence(p, x * (1.0 - p))
+    started = np.cumsum(observed, axis=0) >= max(min_periods, 1)
+    return np.where(started, weighted, np.nan)
+
+
+def SMA_many(tickers, panel, length):
+    """
+    Simple moving average of the close for every ticker in one pass.
+
+    :param panel: OhlcvPanel, OhlcvIngestor or ``data["ohlcv"]``
+    :return: Dict of ticker -> array over bars, NaN where the window is incomplete
+    """
+    tickers, closes = _closes(tickers, panel)
+    return _by_ticker(tickers, rolling_sum(closes, length) / length)
+
+
+def STDEV_many(tickers, panel, length):
+    """Rolling sample (ddof=1) standard deviation of the close for every ticker."""
+    tickers, closes = _closes(tickers, panel)
+    if len(closes):
+        closes = closes - np.nanmean(closes, axis=0)
+    mean = rolling_sum(closes, length) / length
+    squares = rolling_sum(closes * closes, length)
+    variance = np.maximum(squares - length * mean * mean, 0.0) / (length - 1)
+    return _by_ticker(tickers, np.sqrt(variance))
+
+
+def Momentum_many(tickers, panel, length=10):
+    """Change in close over ``length`` bars for every ticker."""
+    tickers, closes = _closes(tickers, panel)
+    out = np.full(closes.shape, np.nan)
+    out[length:] = closes[length:] - closes[:-length]
+    return _by_ticker(tickers, out)
+
+
+def EMA_many(tickers, panel, length):
+    """
+    EMA of the close for every ticker, each seeded with the SMA of its first
+    ``length`` bars from the ticker's first valid bar, as ``EMA`` does.
+    """
+    tickers, closes = _closes(tickers, panel)
+    seeded = np.full(closes.shape, np.nan)
+    valid = ~np.isnan(closes)
+    first = np.where(valid.any(axis=0), valid.argmax(axis=0), len(closes))
+    for i, start in enumerate(first):
+        stop = start + length
+        if stop <= len(closes):
+            seeded[stop - 1, i] = closes[start:stop, i].mean()
+            seeded[stop:, i] = closes[stop:, i]
+    return _by_ticker(tickers, _ewm(seeded, 2.0 / (length + 1), adjust=False))
+
+
+def RSI_many(tickers, panel, length=14):
+    """Wilder RSI of the close for every ticker."""
+    tickers, closes = _closes(tickers, panel)
+    change = np.full(closes.shape, np.nan)
+    change[1:] = np.diff(closes, axis=0)
+    gain = _ewm(np.where(change < 0, 0.0, change), 1.0 / length, adjust=True, min_periods=length)
+    loss = _ewm(np.where(change > 0, 0.0, change), 1.0 / length, adjust=True, min_periods=length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _by_ticker(tickers, 100 * gain / (gain + np.abs(loss)))
@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+
+from .kernels import RollingExtreme
+
+
+class _Extremes:
+    """Rolling and all-time extremes of one ticker."""
+
+    def __init__(self, windows):
+        self.rolling = {
+            key: (RollingExtreme(key[1], largest=True, partial=True),
+                  RollingExtreme(key[1], largest=False, partial=True))
+            for key in windows
+        }
+        self.peak = math.nan
+        self.last = math.nan
+        self.max_drawdown = 0.0
+
+    def update(self, values, close, keys=None):
+        """Push one bar into the windows ``keys`` (all by default); only a full update moves the peak."""
+        for key in self.rolling if keys is None else keys:
+            highest, lowest = self.rolling[key]
+            highest.push(values[key[0]])
+            lowest.push(values[key[0]])
+        if close is not None and keys is None:
+            self.last = close
+            if not close <= self.peak:
+                self.peak = close
+            if self.peak > 0:
+                self.max_drawdown = min(self.max_drawdown, close / self.peak - 1)
+
+
+class ExtremesTracker:
+    """
+    Rolling highs/lows and all-time high/drawdown per ticker, fed by an OhlcvIngestor.
+
+    Windows are registered with ``watch(length, field="close")``; for each
+    one a monotonic deque per ticker keeps the max and min of the ticker's
+    last ``length`` valid bars, so ``high("SPY", 63)`` is
+    ``max(closes[-63:])`` without rescanning, O(1) amortized per bar. Every
+    ticker also accumulates its all-time high close (``peak``), the current
+    ``drawdown`` from it and the worst drawdown so far (``max_drawdown``);
+    drawdowns start once the peak is positive.
+
+    A window watched after the tracker is subscribed is first filled from
+    the bars the panel holds, so it answers as if it had been there from
+    the start (as far back as a bounded panel reaches).
+    """
+
+    def __init__(self, tickers=None, windows=()):
+        """
+        :param windows: Lengths, or ``(length, field)`` pairs, to watch from the start
+        """
+        self.tickers = list(tickers) if tickers is not None else None
+        self.windows = []
+        self._extremes = {}
+        self._panel = None
+        for window in windows:
+            if isinstance(window, tuple):
+                self.watch(*window)
+            else:
+                self.watch(window)
+
+    def watch(self, length, field="close"):
+        key = (field, length)
+        if key not in self.windows:
+            self.windows.append(key)
+            for extremes in self._extremes.values():
+                extremes.rolling[key] = (RollingExtreme(length, largest=True, partial=True),
+                                         RollingExtreme(length, largest=False, partial=True))
+            if self._panel is not None:
+                self._feed(self._panel, 0, [key])
+        return self
+
+    def on_rebuild(self, panel):
+        tickers = self.tickers if self.tickers is not None else panel.tickers
+        self._extremes = {ticker: _Extremes(self.windows) for ticker in tickers}
+        self._panel = panel
+        self._feed(panel, 0)
+
+    def on_append(self, panel, count):
+        for ticker in panel.tickers:
+            if self.tickers is None and ticker not in self._extremes:
+                self._extremes[ticker] = _Extremes(self.windows)
+        self._panel = panel
+        self._feed(panel, max(len(panel) - count, 0))
+
+    def high(self, ticker, length=None, field="close"):
+        """Max of ``field`` over the ticker's last ``length`` bars, or the all-time high close."""
+        if length is None:
+            return self._extremes[ticker].peak
+        return self._extremes[ticker].rolling[(field, length)][0].value
+
+    def low(self, ticker, length, field="close"):
+        return self._extremes[ticker].rolling[(field, length)][1].value
+
+    def peak(self, ticker):
+        return self._extremes[ticker].peak
+
+    def drawdown(self, ticker):
+        """Latest close relative to the all-time high, minus one (0 at a new high; NaN while it is not positive)."""
+        extremes = self._extremes[ticker]
+        return extremes.last / extremes.peak - 1 if extremes.peak > 0 else math.nan
+
+    def max_drawdown(self, ticker):
+        return self._extremes[ticker].max_drawdown
+
+    def _feed(self, panel, first, keys=None):
+        fields = {field for field, _ in self.windows} | {"close"}
+        fields = [field for field in fields if field in panel.field_index]
+        for ticker, extremes in self._extremes.items():
+            if ticker not in panel.ticker_index:
+                continue
+            array = panel.array(ticker)
+            valid = panel.valid(ticker)
+            for row in np.flatnonzero(valid[first:]) + first:
+                values = {field: float(array[row, panel.field_index[field]]) for field in fields}
+                extremes.update(values, values.get("close"), keys)
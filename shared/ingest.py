@@ -0,0 +1,122 @@
+import numpy as np
+
+from .panel import FIELDS, OhlcvPanel
+from .trading_calendar import TradingCalendar
+
+
+class OhlcvIngestor:
+    """
+    Keeps an OhlcvPanel in step with the growing ``data["ohlcv"]`` history.
+
+    Each ``run(data)`` call receives the full history with one new bar at the
+    end. ``update`` finds the last bar it ingested in the new history and
+    appends only the bars after it, making a replay O(N) overall. If the
+    history was rewritten (adjusted prices, a new ticker, a shorter list) the
+    panel is rebuilt from scratch. Only the first and the last ingested bars
+    are compared, so a rewrite that leaves both unchanged goes unnoticed;
+    call ``reset`` after one.
+
+    Objects registered with ``subscribe`` are kept in step with the panel:
+    ``on_rebuild(panel)`` after a rebuild and ``on_append(panel, count)`` after
+    ``count`` bars were appended. A TradingCalendar (a DateIndex with session
+    columns) over the bar dates is always subscribed and available as ``dates``.
+    """
+
+    def __init__(self, tickers=None, fields=FIELDS, dtype=np.float64, max_bars=None, holidays=(), compact=False):
+        self.tickers = list(tickers) if tickers is not None else None
+        self.fields = fields
+        self.dtype = dtype
+        self.max_bars = max_bars
+        self.compact = compact
+        self.panel = None
+        self.subscribers = []
+        self.appended = 0
+        self.rebuilds = 0
+        self._seen = 0
+        self._first_bar = None
+        self._last_bar = None
+        self.dates = self.subscribe(TradingCalendar(holidays=holidays))
+
+    def update(self, ohlcv):
+        """
+        Ingest the latest history and return the up-to-date panel.
+
+        :param ohlcv: ``data["ohlcv"]`` as passed to ``Strategy.run``
+        """
+        if not ohlcv:
+            return self._rebuild(ohlcv)
+        start = self._new_bars_start(ohlcv)
+        if start is None:
+            return self._rebuild(ohlcv)
+        new_bars = ohlcv[start:]
+        if new_bars:
+            self.panel.extend(new_bars)
+            self.appended += len(new_bars)
+            for subscriber in self.subscribers:
+                subscriber.on_append(self.panel, len(new_bars))
+        self._remember(ohlcv)
+        return self.panel
+
+    def subscribe(self, subscriber):
+        """Register an object with ``on_rebuild``/``on_append`` and bring it up to date."""
+        self.subscribers.append(subscriber)
+        if self.panel is not None:
+            subscriber.on_rebuild(self.panel)
+        return subscriber
+
+    def reset(self):
+        self.panel = None
+        self._seen = 0
+        self._first_bar = None
+        self._last_bar = None
+
+    def _new_bars_start(self, ohlcv):
+        """
+        Index of the first bar not yet ingested, or None when a rebuild is needed.
+
+        Looks for the last ingested bar at its old position, or near the end
+        of a sliding window, and for a growing history also checks the first
+        bar; bars in between are not compared.
+        """
+        if self.panel is None or self._last_bar is None:
+            return None
+        n = len(ohlcv)
+        if n >= self._seen and _same_bar(ohlcv[self._seen - 1], self._last_bar):
+            if not _same_bar(ohlcv[0], self._first_bar):
+                return None
+            start = self._seen
+        else:
+            # A platform that hands over a trailing window of fixed length slides
+            # the whole list; look for the previous last bar near the end instead.
+            start = None
+            for i in range(n - 2, max(n - 10, -1), -1):
+                if _same_bar(ohlcv[i], self._last_bar):
+                    start = i + 1
+                    break
+            if start is None:
+                return None
+        if self.tickers is None:
+            index = self.panel.ticker_index
+            for bar in ohlcv[start:]:
+                for ticker in bar:
+                    if ticker not in index:
+                        return None
+        return start
+
+    def _rebuild(self, ohlcv):
+        self.rebuilds += 1
+        self.panel = OhlcvPanel.from_ohlcv(ohlcv, tickers=self.tickers, fields=self.fields,
+                                           dtype=self.dtype, max_bars=self.max_bars, compact=self.compact)
+        self._remember(ohlcv)
+        for subscriber in self.subscribers:
+            subscriber.on_rebuild(self.panel)
+        return self.panel
+
+    def _remember(self, ohlcv):
+        self._seen = len(ohlcv)
+        self._first_bar = ohlcv[0] if ohlcv else None
+        self._last_bar = ohlcv[-1] if ohlcv else None
+
+
+def _same_bar(a, b):
+    return a is b or a == b
@@ -0,0 +1,235 @@
+import numpy as np
+
+from .kernels import TickerBank
+
+# prior variance of the unknown initial trend, relative to the model's variances
+_DIFFUSE = 1e6
+
+
+def _per_ticker(value, tickers):
+    """Array of ``value`` per ticker; ``value`` may be a scalar or a dict of ticker -> value."""
+    if isinstance(value, dict):
+        return np.array([value[ticker] for ticker in tickers], dtype=np.float64)
+    return np.full(len(tickers), value, dtype=np.float64)
+
+
+class KalmanTrend:
+    """
+    Local-level or local-linear-trend Kalman filter updated one observation at a time.
+
+    The observation is ``y = level + noise`` (``observation_variance``);
+    the level moves by ``trend`` plus noise (``level_variance``) and the
+    trend itself follows a random walk (``trend_variance``). With
+    ``trend_variance=None`` there is no trend and this is the local-level
+    model, an exponential smoother whose gain adapts to the noise ratio.
+
+    ``update`` is O(1): a predict and an update of a two-element state and
+    its 2x2 covariance. ``y`` may be a float or an array (e.g. one row of
+    closes across tickers), filtering every element at once, and the
+    variances may be arrays of the same shape. NaN observations leave that
+    element untouched. The first observation sets the level; the trend
+    starts from a diffuse prior, so it is ``y[1] - y[0]`` after the second.
+
+    With ``log=True`` the filter runs on log prices and ``value`` and
+    ``forecast`` are converted back to prices, which keeps one set of
+    variances valid across a large price range (e.g. crypto).
+    """
+
+    def __init__(self, level_variance, trend_variance=None, observation_variance=1.0, log=False):
+        self.level_variance = np.asarray(level_variance, dtype=np.float64)
+        self.has_trend = trend_variance is not None
+        self.trend_variance = np.asarray(trend_variance if self.has_trend else 0.0, dtype=np.float64)
+        self.observation_variance = np.asarray(observation_variance, dtype=np.float64)
+        self.log = log
+        self.level = self.trend = self.variance = np.nan
+        self.innovation = self.innovation_variance = np.nan
+        self.count = 0
+        self._p01 = self._p11 = None
+
+    @property
+    def value(self):
+        """Filtered level, in price units when ``log`` is set."""
+        return np.exp(self.level) if self.log else self.level
+
+    def forecast(self, steps=1):
+        """Level expected ``steps`` observations ahead."""
+        level = self.level + steps * self.trend
+        return np.exp(level) if self.log else level
+
+    def update(self, y):
+        y = np.asarray(y, dtype=np.float64)
+        if self.log:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                y = np.log(np.where(y > 0, y, np.nan))
+        if self._p01 is None:
+            self._start(y.shape)
+        observed = ~np.isnan(y)
+        first = observed & (self.count == 0)
+        running = observed & (self.count > 0)
+        h = self.observation_variance
+        # predict
+        level = self.level + self.trend
+        p00 = self.variance + 2 * self._p01 + self._p11 + self.level_variance
+        p01 = self._p01 + self._p11
+        p11 = self._p11 + self.trend_variance
+        # update
+        f = p00 + h
+        innovation = y - level
+        k0 = p00 / f
+        k1 = p01 / f
+        updated = (level + k0 * innovation, self.trend + k1 * innovation,
+                   p00 * h / f, p01 * h / f, p11 - k1 * p01)
+        # first observation: level = y, diffuse trend
+        diffuse = _DIFFUSE * (h + self.level_variance + self.trend_variance) if self.has_trend else 0.0
+        started = (y, 0.0, h, 0.0, diffuse)
+        current = (self.level, self.trend, self.variance, self._p01, self._p11)
+        self.level, self.trend, self.variance, self._p01, self._p11 = (
+            np.where(first, new, np.where(running, step, old))[()]
+            for new, step, old in zip(started, updated, current)
+        )
+        self.innovation = np.where(running, innovation, np.nan)[()]
+        self.innovation_variance = np.where(running, f, np.nan)[()]
+        self.count = (self.count + observed)[()]
+        return self.value
+
+    def _start(self, shape):
+        blank = np.full(shape, np.nan)
+        self.level, self.variance = blank.copy()[()], blank.copy()[()]
+        self.trend, self._p01, self._p11 = (np.zeros(shape)[()] for _ in range(3))
+        self.count = np.zeros(shape, dtype=np.int64)[()]
+
+
+def kalman_filter(values, level_variance, trend_variance=None, observation_variance=1.0, log=False):
+    """
+    Run a KalmanTrend over every bar.
+
+    :param values: Array over bars, or a (bar, ticker) array filtered column by column
+    :return: Dict of ``level`` (in price units with ``log``), ``trend`` and
+        ``variance`` (of the level) arrays of the same shape
+    """
+    values = np.asarray(values, dtype=np.float64)
+    kalman = KalmanTrend(level_variance, trend_variance, observation_variance, log=log)
+    out = {key: np.full(values.shape, np.nan) for key in ("level", "trend", "variance")}
+    for row, y in enumerate(values):
+        out["level"][row] = kalman.update(y)
+        out["trend"][row] = kalman.trend
+        out["variance"][row] = kalman.variance
+    return out
+
+
+def estimate_kalman(values, trend=True, log=False, level_ratios=None, trend_ratios=None):
+    """
+    Maximum-likelihood variances for a KalmanTrend, estimated offline on a history.
+
+    The observation variance is concentrated out of the Gaussian likelihood,
+    leaving the ratios ``level_variance / observation_variance`` (and
+    ``trend_variance / observation_variance``) to search. Every pair on a
+    log-spaced grid is filtered at once as one vectorized KalmanTrend, then
+    the grid is refined around the best pair.
+
+    :param values: Array of observations over bars (prices; ``log`` filters log prices)
+    :param trend: Estimate the local-linear-trend model, else the local-level one
+    :return: Dict of ``level_variance``, ``trend_variance`` (None without
+        trend), ``observation_variance`` and ``log_likelihood``, ready for
+        ``KalmanTrend(**params)`` once ``log_likelihood`` is dropped
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if log:
+        values = np.log(values)
+    values = values[~np.isnan(values)]
+    level_ratios = np.logspace(-6, 2, 17) if level_ratios is None else np.asarray(level_ratios, dtype=np.float64)
+    if trend:
+        trend_ratios = np.logspace(-10, -2, 17) if trend_ratios is None else np.asarray(trend_ratios, dtype=np.float64)
+    for _ in range(3):
+        if trend:
+            grid_level, grid_trend = (axis.ravel() for axis in np.meshgrid(level_ratios, trend_ratios))
+        else:
+            grid_level, grid_trend = level_ratios, None
+        likelihood, scale = _concentrated_likelihood(values, grid_level, grid_trend)
+        best = int(np.nanargmax(likelihood))
+        level_ratios = _refine(level_ratios, grid_level[best])
+        if trend:
+            trend_ratios = _refine(trend_ratios, grid_trend[best])
+    return {
+        "level_variance": float(grid_level[best] * scale[best]),
+        "trend_variance": float(grid_trend[best] * scale[best]) if trend else None,
+        "observation_variance": float(scale[best]),
+        "log_likelihood": float(likelihood[best]),
+    }
+
+
+def _concentrated_likelihood(values, level_ratios, trend_ratios):
+    """Log-likelihood and observation variance for each ratio pair, skipping the diffuse start."""
+    kalman = KalmanTrend(level_ratios, trend_ratios, 1.0)
+    skip = 2 if trend_ratios is not None else 1
+    squares = np.zeros(len(level_ratios))
+    log_f = np.zeros(len(level_ratios))
+    row = np.empty(len(level_ratios))
+    for i, y in enumerate(values):
+        row.fill(y)
+        kalman.update(row)
+        if i >= skip:
+            squares += kalman.innovation ** 2 / kalman.innovation_variance
+            log_f += np.log(kalman.innovation_variance)
+    n = max(len(values) - skip, 1)
+    scale = squares / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        likelihood = -0.5 * (n * np.log(2 * np.pi * scale) + log_f + n)
+    return likelihood, scale
+
+
+def _refine(ratios, best):
+    """A finer log-spaced grid spanning one step of ``ratios`` either side of ``best``."""
+    step = np.log10(ratios[1] / ratios[0]) if len(ratios) > 1 else 1.0
+    return np.logspace(np.log10(best) - step, np.log10(best) + step, 9)
+
+
+class KalmanBank(TickerBank):
+    """
+    KalmanTrend filters of one field for every ticker, fed by an OhlcvIngestor.
+
+    On rebuild the filter runs over the panel's history as one recursion
+    vectorized across tickers; each appended bar then costs one O(1)
+    update for all tickers together, whatever the bar interval. Variances
+    may be scalars or dicts of ticker -> value (e.g. from
+    ``estimate_kalman`` per ticker). Bars where a ticker is missing leave
+    its filter untouched.
+
+    ``level(ticker)`` is the filtered price, usable where a short EMA
+    served as a smoothed exit line, e.g. leaving a Bollinger breakout when
+    the close falls below it; ``trend(ticker)`` is its slope per bar (per
+    bar in log terms with ``log``).
+    """
+
+    def __init__(self, tickers, level_variance, trend_variance=None, observation_variance=1.0,
+                 field="close", log=False):
+        super().__init__(tickers, field)
+        self.log = log
+        self._variances = (level_variance, trend_variance, observation_variance)
+        self._kalman = None
+
+    def level(self, ticker=None):
+        return self._read(self._kalman.value, ticker)
+
+    def trend(self, ticker=None):
+        return self._read(self._kalman.trend, ticker)
+
+    def forecast(self, ticker=None, steps=1):
+        return self._read(self._kalman.forecast(steps), ticker)
+
+    def _rebuild(self, panel):
+        level, trend, observation = self._variances
+        self._kalman = KalmanTrend(
+            _per_ticker(level, self.tickers),
+            _per_ticker(trend, self.tickers) if trend is not None else None,
+            _per_ticker(observation, self.tickers),
+            log=self.log,
+        )
+
+    def _append(self, panel, first):
+        for row_values in self._rows(panel, first):
+            self._kalman.update(row_values)
+
+    def _read(self, values, ticker):
+        values = np.broadcast_to(values, (len(self.tickers),))
+        return values if ticker is None else float(values[self.ticker_index[ticker]])
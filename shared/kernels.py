@@ -0,0 +1,610 @@
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def rolling_sum(values, length):
+    """Sum over the trailing ``length`` rows per column; NaN while the window is short or has a gap."""
+    n = len(values)
+    out = np.full(values.shape, np.nan)
+    if n < length:
+        return out
+    missing = np.isnan(values)
+    total = np.cumsum(np.where(missing, 0.0, values), axis=0)
+    gaps = np.cumsum(missing, axis=0)
+    window = total[length - 1:].copy()
+    window[1:] -= total[:n - length]
+    holes = gaps[length - 1:].copy()
+    holes[1:] -= gaps[:n - length]
+    out[length - 1:] = np.where(holes > 0, np.nan, window)
+    return out
+
+
+def wma(values, length):
+    """
+    Linearly weighted moving average along the bar axis.
+
+    One strided matrix product over all windows, the same dot product the
+    ``rolling(length).apply(lambda x: np.dot(x, weights) / weights.sum())``
+    idiom evaluates in a Python call per window.
+
+    :param values: Array over bars, or a (bar, ticker) array
+    :return: Array of the same shape, NaN for the first ``length - 1`` bars
+        and for windows containing NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= length:
+        windows = sliding_window_view(values, length, axis=0)
+        out[length - 1:] = windows @ np.arange(1, length + 1, dtype=np.float64) / (length * (length + 1) / 2)
+    return out
+
+
+def hma(values, length):
+    """Hull moving average ``WMA(2 * WMA(n // 2) - WMA(n), int(sqrt(n)))``."""
+    raw = 2 * wma(values, length // 2) - wma(values, length)
+    return wma(raw, int(np.sqrt(length)))
+
+
+def _regression_basis(length):
+    """Centered position ``x - (length - 1) / 2`` and its sums of squares and fourth powers."""
+    u = np.arange(length, dtype=np.float64) - (length - 1) / 2
+    suu = length * (length * length - 1) / 12
+    su4 = length * (length * length - 1) * (3 * length * length - 7) / 240
+    return u, suu, su4 - suu * suu / length
+
+
+def _regression_fit(length, mean, suy, syy, spy):
+    """
+    Line and parabola fits from centered window sums (see rolling_regression).
+
+    :param suy: ``sum((x - m) * y)``
+    :param syy: ``sum((y - mean) ** 2)``
+    :param spy: ``sum(((x - m) ** 2 - suu / length) * y)``
+    """
+    _, suu, spp = _regression_basis(length)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = suy / suu
+        r2 = np.minimum(suy * suy / (suu * syy), 1.0)
+        curvature = 2 * spy / spp if spp else np.full(np.shape(mean), np.nan)
+    return {"slope": slope, "intercept": mean - slope * (length - 1) / 2, "r2": r2, "curvature": curvature}
+
+
+def rolling_regression(values, length):
+    """
+    Least-squares fits over the trailing ``length`` bars.
+
+    Bars are numbered 0 .. length - 1 within each window. ``slope`` and
+    ``intercept`` (the fitted value at the window's first bar) come from a
+    straight-line fit, ``r2`` is its coefficient of determination and
+    ``curvature`` is the second derivative ``2 * c`` of a parabola
+    ``a + b * x + c * x ** 2`` fitted to the same window.
+
+    :param values: Array over bars, or a (bar, ticker) array
+    :return: Dict of ``slope``, ``intercept``, ``r2`` and ``curvature``
+        arrays of the same shape; NaN for the first ``length - 1`` bars and
+        for windows containing NaN (``r2`` is NaN for flat windows,
+        ``curvature`` when ``length < 3``)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = {key: np.full(values.shape, np.nan) for key in ("slope", "intercept", "r2", "curvature")}
+    if len(values) >= length:
+        u, suu, _ = _regression_basis(length)
+        windows = sliding_window_view(values, length, axis=0)
+        mean = windows.mean(axis=-1)
+        syy = ((windows - mean[..., None]) ** 2).sum(axis=-1)
+        fit = _regression_fit(length, mean, windows @ u, syy, windows @ (u * u - suu / length))
+        for key, value in fit.items():
+            out[key][length - 1:] = value
+    return out
+
+
+class RollingWma:
+    """
+    Incremental WMA keeping the window sum and weighted sum.
+
+    Sliding the window by one bar is ``weighted += length * x - total``
+    followed by ``total += x - oldest``, so each ``update`` is O(1); both
+    sums are recomputed exactly every ``length`` bars to bound drift.
+    ``update`` returns NaN until the window is full.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.window = []
+        self.total = 0.0
+        self.weighted = 0.0
+        self._head = 0
+        self._pushes = 0
+        self._divisor = length * (length + 1) / 2
+
+    @property
+    def value(self):
+        return self.weighted / self._divisor if len(self.window) == self.length else np.nan
+
+    def update(self, x):
+        if len(self.window) < self.length:
+            self.window.append(x)
+            self.weighted += len(self.window) * x
+            self.total += x
+            return self.value
+        oldest = self.window[self._head]
+        self.window[self._head] = x
+        self._head = (self._head + 1) % self.length
+        self.weighted += self.length * x - self.total
+        self.total += x - oldest
+        self._pushes += 1
+        if self._pushes % self.length == 0:
+            ordered = np.roll(np.asarray(self.window), -self._head)
+            self.total = float(ordered.sum())
+            self.weighted = float(ordered @ np.arange(1, self.length + 1, dtype=np.float64))
+        return self.value
+
+
+class RollingHma:
+    """Incremental HMA built from three RollingWma; NaN until all windows are full."""
+
+    def __init__(self, length):
+        self.length = length
+        self._half = RollingWma(length // 2)
+        self._full = RollingWma(length)
+        self._hull = RollingWma(int(np.sqrt(length)))
+        self.value = np.nan
+
+    def update(self, x):
+        raw = 2 * self._half.update(x) - self._full.update(x)
+        if raw == raw:
+            self.value = self._hull.update(raw)
+        return self.value
+
+
+class RollingExtreme:
+    """
+    Rolling max (or min) of the last ``length`` values with a monotonic deque.
+
+    Each value is pushed and popped at most once, so ``push`` is O(1)
+    amortized. ``push`` returns NaN until ``length`` values were seen, like
+    ``rolling(length).max()``, or the extreme of the values so far with
+    ``partial=True``, like ``max(values[-length:])``.
+    """
+
+    def __init__(self, length, largest=True, partial=False):
+        self.length = length
+        self.largest = largest
+        self.partial = partial
+        self.count = 0
+        self._deque = deque()
+
+    @property
+    def value(self):
+        if not self._deque or (self.count < self.length and not self.partial):
+            return np.nan
+        return self._deque[0][1]
+
+    def push(self, x):
+        d = self._deque
+        if self.largest:
+            while d and d[-1][1] <= x:
+                d.pop()
+        else:
+            while d and d[-1][1] >= x:
+                d.pop()
+        d.append((self.count, x))
+        self.count += 1
+        if d[0][0] <= self.count - 1 - self.length:
+            d.popleft()
+        return self.value
+
+
+class RollingMean:
+    """
+    ``rolling(length).mean()`` one value at a time.
+
+    Follows pandas' add/remove updates step for step (Kahan-compensated
+    running sum, separate compensation for additions and removals, the
+    sign and repeated-value corrections), so values are identical to the
+    batch version, not just close. NaN values are skipped; the mean is NaN
+    until ``length`` values are in the window.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.value = np.nan
+        self._window = deque()
+        self._nobs = 0
+        self._sum = 0.0
+        self._negative = 0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._repeats = 0
+        self._previous = None
+
+    def update(self, x):
+        if len(self._window) == self.length:
+            self._remove(self._window.popleft())
+        self._window.append(x)
+        if x == x:
+            self._nobs += 1
+            y = x - self._add_compensation
+            t = self._sum + y
+            self._add_compensation = t - self._sum - y
+            self._sum = t
+            if np.signbit(x):
+                self._negative += 1
+            self._repeats = self._repeats + 1 if x == self._previous else 1
+            self._previous = x
+        elif self._previous is None:
+            self._previous = x
+        self.value = self._mean()
+        return self.value
+
+    def _remove(self, x):
+        if x == x:
+            self._nobs -= 1
+            y = -x - self._remove_compensation
+            t = self._sum + y
+            self._remove_compensation = t - self._sum - y
+            self._sum = t
+            if np.signbit(x):
+                self._negative -= 1
+
+    def _mean(self):
+        if self._nobs < self.length or not self._nobs:
+            return np.nan
+        if self._repeats >= self._nobs:
+            return self._previous
+        result = self._sum / self._nobs
+        if (self._negative == 0 and result < 0) or (self._negative == self._nobs and result > 0):
+            return 0.0
+        return result
+
+
+class RollingVariance:
+    """
+    ``rolling(length).var(ddof)`` one value at a time, following pandas'
+    Kahan-compensated Welford add/remove updates so values are identical to
+    the batch version. ``std`` is its square root. NaN values are skipped.
+
+    ``length=None`` keeps only the Welford additions, giving
+    ``expanding().var(ddof)`` in O(1) memory.
+    """
+
+    def __init__(self, length, ddof=1):
+        self.length = length
+        self.ddof = ddof
+        self.value = np.nan
+        self._window = deque()
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._repeats = 0
+        self._previous = None
+
+    @property
+    def std(self):
+        return np.sqrt(self.value) if self.value > 0 else (0.0 if self.value == 0 else self.value)
+
+    @property
+    def mean(self):
+        """Running mean of the values counted, NaN while ``value`` is."""
+        return self._mean if self.value == self.value else np.nan
+
+    def update(self, x):
+        if self.length is not None:
+            if len(self._window) == self.length:
+                self._remove(self._window.popleft())
+            self._window.append(x)
+        if self._previous is None:
+            self._previous = x
+        if x == x:
+            self._nobs += 1
+            self._repeats = self._repeats + 1 if x == self._previous else 1
+            self._previous = x
+            previous_mean = self._mean - self._add_compensation
+            y = x - self._add_compensation
+            t = y - self._mean
+            self._add_compensation = t + self._mean - y
+            self._mean = self._mean + t / self._nobs
+            self._ssqdm = self._ssqdm + (x - previous_mean) * (x - self._mean)
+        self.value = self._variance()
+        return self.value
+
+    def _remove(self, x):
+        if x != x:
+            return
+        self._nobs -= 1
+        if self._nobs:
+            previous_mean = self._mean - self._remove_compensation
+            y = x - self._remove_compensation
+            t = y - self._mean
+            self._remove_compensation = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (x - previous_mean) * (x - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+    def _variance(self):
+        if (self.length is not None and self._nobs < self.length) or self._nobs <= self.ddof:
+            return np.nan
+        if self._nobs == 1 or self._repeats >= self._nobs:
+            return 0.0
+        return self._ssqdm / (self._nobs - self.ddof)
+
+
+class RollingRegression:
+    """
+    Incremental ``rolling_regression`` with O(1) updates.
+
+    Keeps ``sum(y)``, ``sum(x * y)``, ``sum(x ** 2 * y)`` and ``sum(y ** 2)``
+    over the window in running form: sliding by one bar renumbers the bars
+    left with ``sxy -= sy - oldest`` (and the matching identity for
+    ``x ** 2``), so no window is re-summed. The sums are recomputed exactly
+    every ``length`` bars to bound drift, relative to the window mean at
+    that point so ``sum(y ** 2)`` does not swamp the variance. ``x`` may be
+    a float or an array (e.g. one row of closes across tickers), fitting
+    every element at once; a NaN makes that element's fit NaN until it
+    leaves the window.
+
+    After each ``update`` the ``slope``, ``intercept``, ``r2`` and
+    ``curvature`` attributes hold the latest fit (NaN until the window is
+    full); ``update`` returns ``slope``.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.slope = self.intercept = self.r2 = self.curvature = np.nan
+        self._window = None
+        self._head = 0
+        self._count = 0
+        self._pushes = 0
+
+    def update(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        if self._window is None:
+            self._window = np.zeros((self.length,) + x.shape)
+            self._missing = np.zeros((self.length,) + x.shape, dtype=bool)
+            self._holes = np.zeros(x.shape, dtype=np.int64)
+            self._sums = np.zeros((4,) + x.shape)
+            self._anchor = np.zeros(x.shape)
+        missing = np.isnan(x)
+        y = np.where(missing, 0.0, x - self._anchor)
+        sy, sxy, sxxy, syy = self._sums
+        if self._count < self.length:
+            slot = position = self._count
+            self._count += 1
+        else:
+            # drop the oldest bar (x = 0) and renumber the others x - 1
+            slot, position = self._head, self.length - 1
+            self._head = (self._head + 1) % self.length
+            oldest = self._window[slot]
+            rest = sy - oldest
+            sxxy = sxxy - 2 * sxy + rest
+            sxy = sxy - rest
+            sy = rest
+            syy = syy - oldest * oldest
+            self._holes -= self._missing[slot]
+        self._holes += missing
+        self._window[slot] = y
+        self._missing[slot] = missing
+        self._sums = np.array([sy + y, sxy + position * y, sxxy + position * position * y, syy + y * y])
+        self._pushes += 1
+        if self._pushes % self.length == 0:
+            self._refresh()
+        if self._count == self.length:
+            self._fit()
+        return self.slope
+
+    def _refresh(self):
+        ordered = np.roll(self._window, -self._head, axis=0)
+        shift = ordered.mean(axis=0)
+        self._anchor = self._anchor + shift
+        self._window -= shift
+        ordered -= shift
+        x = np.arange(self._count, dtype=np.float64)
+        self._sums = np.array([ordered.sum(axis=0), np.tensordot(x, ordered, 1),
+                               np.tensordot(x * x, ordered, 1), (ordered * ordered).sum(axis=0)])
+
+    def _fit(self):
+        n = self.length
+        sy, sxy, sxxy, syy = self._sums
+        m = (n - 1) / 2
+        _, suu, _ = _regression_basis(n)
+        mean = self._anchor + sy / n
+        suy = sxy - m * sy
+        spy = sxxy - 2 * m * sxy + (m * m - suu / n) * sy
+        fit = _regression_fit(n, mean, suy, np.maximum(syy - sy * sy / n, 0.0), spy)
+        for key, value in fit.items():
+            setattr(self, key, np.where(self._holes > 0, np.nan, value)[()])
+
+
+class RowBuffer:
+    """
+    Appendable array of rows (floats of ``shape`` each) with amortized growth.
+
+    Storage doubles when full. With ``max_length`` set only the newest rows
+    are guaranteed to be kept: when storage fills up the rows older than
+    ``max_length`` are dropped by compacting in place instead of growing,
+    and ``start`` counts the rows dropped so far.
+    """
+
+    def __init__(self, shape=(), max_length=None, capacity=256):
+        self.shape = tuple(shape)
+        self.max_length = max_length
+        self.start = 0
+        self._length = 0
+        # name -> [array, leading rows]; arrays hold ``leading + length`` rows in use
+        self._arrays = {"values": [np.full((capacity,) + self.shape, np.nan), 0]}
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def values(self):
+        """View of the rows held."""
+        return self._arrays["values"][0][:self._length]
+
+    def append(self, row):
+        return self.extend(np.asarray(row, dtype=np.float64)[None])
+
+    def extend(self, rows):
+        rows = np.asarray(rows, dtype=np.float64).reshape((-1,) + self.shape)
+        if len(rows):
+            self._store({"values": rows})
+        return self
+
+    def _store(self, blocks):
+        count = len(blocks["values"])
+        if self.max_length is not None and count > self.max_length:
+            self.start += self._length + count - self.max_length
+            self._length = 0
+            for name, (array, leading) in self._arrays.items():
+                array[:leading] = blocks[name][count - self.max_length - leading:count - self.max_length]
+            blocks = {name: block[-self.max_length:] for name, block in blocks.items()}
+            count = self.max_length
+        self._reserve(count)
+        for name, (array, leading) in self._arrays.items():
+            array[self._length + leading:self._length + leading + count] = blocks[name]
+        self._length += count
+
+    def _reserve(self, extra):
+        capacity = len(self._arrays["values"][0])
+        if self._length + extra <= capacity:
+            return
+        if self.max_length is not None:
+            keep = max(min(self.max_length - extra, self._length), 0)
+            drop = self._length - keep
+            for array, leading in self._arrays.values():
+                array[:keep + leading] = array[drop:self._length + leading]
+            self.start += drop
+            self._length = keep
+            if keep + extra <= capacity:
+                return
+        rows = max(2 * capacity, self._length + extra)
+        for entry in self._arrays.values():
+            array, leading = entry
+            grown = np.empty((rows + leading,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._length + leading] = array[:self._length + leading]
+            entry[0] = grown
+
+
+class PrefixSums(RowBuffer):
+    """
+    RowBuffer that also keeps running sums and running counts of NaN values.
+
+    The sum of a window of rows is then the difference of two running sums,
+    so ``sum``/``mean`` over any length cost the same. Each column's sums are
+    taken relative to its first valid value (``offset``) to keep them small,
+    which keeps means within about 1e-12 relative of ``rolling(k).mean()``.
+    As with ``rolling(k)`` a window that is short or contains NaN is NaN.
+    """
+
+    def __init__(self, shape=(), max_length=None, capacity=256):
+        super().__init__(shape, max_length, capacity)
+        self.offset = np.full(self.shape, np.nan)
+        self._arrays["sums"] = [np.zeros((capacity + 1,) + self.shape), 1]
+        self._arrays["gaps"] = [np.zeros((capacity + 1,) + self.shape, dtype=np.int64), 1]
+
+    def extend(self, rows):
+        rows = np.asarray(rows, dtype=np.float64).reshape((-1,) + self.shape)
+        if not len(rows):
+            return self
+        missing = np.isnan(rows)
+        # the first valid value of a column; its sums so far are all zero
+        first = np.take_along_axis(rows, missing.argmin(axis=0)[None], axis=0)[0]
+        self.offset = np.where(np.isnan(self.offset) & ~missing.all(axis=0), first, self.offset)
+        offset = np.where(np.isnan(self.offset), 0.0, self.offset)
+        sums, gaps = (self._arrays[name][0][self._length] for name in ("sums", "gaps"))
+        self._store({
+            "values": rows,
+            "sums": sums + np.cumsum(np.where(missing, 0.0, rows - offset), axis=0),
+            "gaps": gaps + np.cumsum(missing, axis=0),
+        })
+        return self
+
+    def sum(self, now, length):
+        """
+        Sum of the ``length`` rows before row ``now`` (i.e. ``values[now - length:now]``).
+
+        ``now`` and ``length`` broadcast against each other; the result has
+        their broadcast shape followed by ``shape``.
+        """
+        total, length = self._window(now, length)
+        return total + length * self.offset
+
+    def mean(self, now, length):
+        """Mean of the ``length`` rows before row ``now``; broadcasts like ``sum``."""
+        total, length = self._window(now, length)
+        return total / np.where(length > 0, length, 1) + self.offset
+
+    def _window(self, now, length):
+        now, length = np.broadcast_arrays(np.asarray(now, dtype=np.int64), np.asarray(length, dtype=np.int64))
+        then = now - length
+        available = (length > 0) & (then >= 0) & (now <= self._length)
+        now, then = np.where(available, now, 0), np.where(available, then, 0)
+        sums, gaps = self._arrays["sums"][0], self._arrays["gaps"][0]
+        columns = (1,) * len(self.shape)
+        unavailable = ~available.reshape(available.shape + columns) | (gaps[now] - gaps[then] > 0)
+        return np.where(unavailable, np.nan, sums[now] - sums[then]), length.reshape(length.shape + columns)
+
+
+class TickerBank:
+    """
+    Base of the OhlcvIngestor subscribers keeping per-ticker state of one panel field.
+
+    ``tickers`` (the panel's own when None) fixes the column order, given by
+    ``ticker_index``; tickers the panel lacks read as NaN. ``on_rebuild``
+    maps those columns onto the panel, calls ``_rebuild(panel)`` to reset
+    the subclass's state and feeds the whole panel to ``_append(panel,
+    first)``, which ``on_append`` calls with the first new row. Subclasses
+    read the new rows with ``_block`` (all at once) or ``_rows`` (one at a
+    time).
+    """
+
+    def __init__(self, tickers=None, field="close"):
+        self.tickers = list(tickers) if tickers is not None else None
+        self.field = field
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers or ())}
+        self._columns = []
+
+    def on_rebuild(self, panel):
+        tickers = self.tickers if self.tickers is not None else panel.tickers
+        self.ticker_index = {ticker: i for i, ticker in enumerate(tickers)}
+        self._columns = [panel.ticker_index.get(ticker) for ticker in tickers]
+        self._rebuild(panel)
+        self._append(panel, 0)
+
+    def on_append(self, panel, count):
+        self._append(panel, max(len(panel) - count, 0))
+
+    def as_dict(self, values):
+        """Ticker -> value (or row) for an array in ``ticker_index`` order."""
+        return {ticker: values[i] for ticker, i in self.ticker_index.items()}
+
+    def _rebuild(self, panel):
+        pass
+
+    def _append(self, panel, first):
+        raise NotImplementedError
+
+    def _block(self, panel, first):
+        """(bar, ticker) array of the field from row ``first`` on."""
+        block = np.full((max(len(panel) - first, 0), len(self._columns)), np.nan)
+        field = panel.field(self.field)
+        for i, column in enumerate(self._columns):
+            if column is not None:
+                block[:, i] = field[first:, column]
+        return block
+
+    def _rows(self, panel, first):
+        """Yield the field's row for each bar from ``first`` on, in one reused array."""
+        field = panel.field(self.field)
+        present = [i for i, column in enumerate(self._columns) if column is not None]
+        columns = [self._columns[i] for i in present]
+        row_values = np.full(len(self._columns), np.nan)
+        for row in range(first, len(panel)):
+            row_values[present] = field[row, columns]
+            yield row_values
@@ -0,0 +1,159 @@
+import numpy as np
+
+from .ingest import _same_bar
+from .panel import FIELDS
+
+
+class AccessStats:
+    """
+    Records which tickers a strategy reads, bar by bar.
+
+    ``begin_bar(n)`` marks the start of a ``run`` call on an ``n``-bar
+    history; ``record(ticker)`` is called on every read. ``summary()`` gives,
+    per ticker, the number of reads, the number of bars on which it was read
+    and the first/last such bar; ``untouched(tickers)`` lists declared tickers
+    that were never read.
+    """
+
+    def __init__(self):
+        self.bar = None
+        self.bars = 0
+        self.reads = {}
+        self.bars_read = {}
+        self.first_bar = {}
+        self.last_bar = {}
+
+    def begin_bar(self, n):
+        self.bar = n
+        self.bars += 1
+
+    def record(self, ticker):
+        self.reads[ticker] = self.reads.get(ticker, 0) + 1
+        if self.last_bar.get(ticker) != self.bar:
+            self.bars_read[ticker] = self.bars_read.get(ticker, 0) + 1
+            self.last_bar[ticker] = self.bar
+            self.first_bar.setdefault(ticker, self.bar)
+
+    def touched(self):
+        return set(self.reads)
+
+    def untouched(self, tickers):
+        return [ticker for ticker in tickers if ticker not in self.reads]
+
+    def summary(self):
+        return {
+            ticker: {
+                "reads": self.reads[ticker],
+                "bars": self.bars_read[ticker],
+                "first_bar": self.first_bar[ticker],
+                "last_bar": self.last_bar[ticker],
+            }
+            for ticker in self.reads
+        }
+
+
+class _Column:
+    """Growing (bar, field) array for one ticker plus its validity mask."""
+
+    def __init__(self, fields, capacity):
+        self.length = 0
+        self.values = np.full((max(capacity, 1), len(fields)), np.nan)
+        self.valid = np.zeros(max(capacity, 1), dtype=bool)
+
+    def reserve(self, size):
+        if size <= len(self.valid):
+            return
+        capacity = max(size, 2 * len(self.valid))
+        values = np.full((capacity, self.values.shape[1]), np.nan)
+        values[:self.length] = self.values[:self.length]
+        valid = np.zeros(capacity, dtype=bool)
+        valid[:self.length] = self.valid[:self.length]
+        self.values = values
+        self.valid = valid
+
+
+class LazyPanel:
+    """
+    Panel facade over ``data["ohlcv"]`` that parses a ticker only once it is read.
+
+    ``update(ohlcv)`` is cheap: it only records the new history. The first
+    ``column(ticker)`` call parses that ticker's bars into an array. Later
+    bars are appended to it as they arrive, so only tickers a strategy
+    actually reads cost parse time or memory. Reads are reported to
+    ``stats``, an AccessStats.
+    """
+
+    def __init__(self, fields=FIELDS, stats=None):
+        self.fields = tuple(fields)
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+        self.stats = stats if stats is not None else AccessStats()
+        self._ohlcv = []
+        self._columns = {}
+        self._first_bar = None
+        self._last_bar = None
+
+    def __len__(self):
+        return len(self._ohlcv)
+
+    @property
+    def materialized(self):
+        return list(self._columns)
+
+    def update(self, ohlcv):
+        n = len(ohlcv)
+        seen = len(self._ohlcv)
+        if self._columns and (n < seen or not seen
+                              or not _same_bar(ohlcv[0], self._first_bar)
+                              or not _same_bar(ohlcv[seen - 1], self._last_bar)):
+            self._columns = {}
+        self._ohlcv = ohlcv
+        self._first_bar = ohlcv[0] if n else None
+        self._last_bar = ohlcv[-1] if n else None
+        self.stats.begin_bar(n)
+        return self
+
+    def column(self, ticker, field="close"):
+        """View of one field for one ticker; NaN where the ticker is missing."""
+        self.stats.record(ticker)
+        column = self._materialize(ticker)
+        return column.values[:column.length, self.field_index[field]]
+
+    def valid(self, ticker):
+        self.stats.record(ticker)
+        column = self._materialize(ticker)
+        return column.valid[:column.length]
+
+    def open(self, ticker):
+        return self.column(ticker, "open")
+
+    def high(self, ticker):
+        return self.column(ticker, "high")
+
+    def low(self, ticker):
+        return self.column(ticker, "low")
+
+    def close(self, ticker):
+        return self.column(ticker, "close")
+
+    def volume(self, ticker):
+        return self.column(ticker, "volume")
+
+    def _materialize(self, ticker):
+        column = self._columns.get(ticker)
+        n = len(self._ohlcv)
+        if column is None:
+            column = self._columns[ticker] = _Column(self.fields, n)
+        if column.length == n:
+            return column
+        column.reserve(n)
+        for row in range(column.length, n):
+            candle = self._ohlcv[row].get(ticker)
+            if not candle:
+                continue
+            for field, f in self.field_index.items():
+                value = candle.get(field)
+                if value is not None:
+                    column.values[row, f] = value
+            column.valid[row] = not np.isnan(column.values[row, self.field_index.get("close", 0)])
+        column.length = n
+        return column
@@ -0,0 +1,80 @@
+import numpy as np
+
+from .kernels import PrefixSums
+
+
+class LookbackSeries:
+    """
+    Appendable series answering trailing sums, means and changes over any k bars in O(1).
+
+    Strategies that derive a lookback from volatility every bar (e.g.
+    ``pct_change(RETLookback).iloc[-1]`` or ``rolling(LongMA).mean()`` with a
+    new length each day) rebuild a frame to read one value. Here each
+    ``append`` extends the values and their running sums, and ``sum(k)``,
+    ``mean(k)`` and ``pct_change(k)`` read two rows, whatever ``k`` is.
+
+    A bar may be a float (``width=None``) or a row of ``width`` floats, e.g.
+    one close per ticker or a ratio of two of them; queries then return a
+    float or an array. As with ``rolling(k)`` a window containing NaN gives
+    NaN, and ``pct_change(k)`` is ``value / value k bars earlier - 1``
+    exactly as pandas computes it. Sums are kept by a ``kernels.PrefixSums``,
+    so means agree with ``rolling(k).mean()`` to about 1e-13.
+
+    For panel fields the same variable-length queries are available from
+    ``MovingAverageBank.means`` and ``ReturnsBank.returns``. With
+    ``max_lookback`` set only the bars that lookback needs are kept;
+    ``start`` counts the bars dropped.
+    """
+
+    def __init__(self, width=None, max_lookback=None):
+        self.width = width
+        self.max_lookback = max_lookback
+        shape = () if width is None else (width,)
+        self._sums = PrefixSums(shape, max_lookback + 1 if max_lookback is not None else None)
+
+    def __len__(self):
+        return len(self._sums)
+
+    @property
+    def start(self):
+        return self._sums.start
+
+    @property
+    def values(self):
+        """View of the bars held."""
+        return self._sums.values
+
+    def append(self, value):
+        self._sums.append(value)
+        return self
+
+    def extend(self, values):
+        self._sums.extend(values)
+        return self
+
+    def value(self, bars_ago=0):
+        row = len(self._sums) - 1 - bars_ago
+        return self._result(self._sums.values[row] if row >= 0 else self._blank())
+
+    def sum(self, k, bars_ago=0):
+        """Sum of the ``k`` bars ending ``bars_ago`` bars before the newest, like ``rolling(k).sum()``."""
+        return self._result(self._sums.sum(len(self._sums) - bars_ago, int(k)))
+
+    def mean(self, k, bars_ago=0):
+        """Mean of the ``k`` bars ending ``bars_ago`` bars before the newest, like ``rolling(k).mean()``."""
+        return self._result(self._sums.mean(len(self._sums) - bars_ago, int(k)))
+
+    def pct_change(self, k, bars_ago=0):
+        """``pct_change(k).iloc[-1 - bars_ago]``; NaN when ``k`` reaches before the first bar."""
+        now = len(self._sums) - 1 - bars_ago
+        then = now - int(k)
+        if now < 0 or then < 0 or then > now:
+            return self._result(self._blank())
+        values = self._sums.values
+        return self._result(values[now] / values[then] - 1)
+
+    def _blank(self):
+        return np.full(self._sums.shape, np.nan)
+
+    def _result(self, value):
+        return float(value) if self.width is None else np.array(value)
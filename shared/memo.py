@@ -0,0 +1,101 @@
+import functools
+import inspect
+
+
+def _candle_key(candle):
+    if not candle:
+        return None
+    return candle.get("date"), candle.get("close")
+
+
+def _newest_date(bar):
+    for candle in bar.values():
+        if candle:
+            return candle.get("date")
+    return None
+
+
+class IndicatorCache:
+    """
+    Per-bar memo for batch indicator calls such as ``RSI(ticker, ohlcv, 14)``.
+
+    Results are keyed by (indicator, ticker, arguments, history fingerprint),
+    the fingerprint being the history length plus the ticker's first and last
+    candle (date, close), so two calls on the same history in one ``run``
+    compute once while calls on different slices stay apart. The cache is
+    scoped to one bar: a call on a history whose newest bar is later than the
+    current one empties it, so memory never grows past one bar's results.
+
+    ``wrap(function)`` returns a drop-in replacement for an indicator
+    function; ``hits`` / ``misses`` count lookups, also per indicator in
+    ``summary()``. Cached results are shared between callers and must not be
+    modified.
+    """
+
+    def __init__(self):
+        self.bar = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.counts = {}
+        self._results = {}
+        self._signatures = {}
+
+    def __len__(self):
+        return len(self._results)
+
+    def wrap(self, function):
+        @functools.wraps(function)
+        def cached(ticker, data, *args, **kwargs):
+            return self.call(function, ticker, data, *args, **kwargs)
+        return cached
+
+    def call(self, function, ticker, data, *args, **kwargs):
+        if not data:
+            return function(ticker, data, *args, **kwargs)
+        self._scope(_newest_date(data[-1]))
+        name = getattr(function, "__name__", repr(function))
+        key = (name, ticker, self._arguments(function, ticker, data, args, kwargs),
+               len(data), _candle_key(data[0].get(ticker)), _candle_key(data[-1].get(ticker)))
+        try:
+            hash(key)
+        except TypeError:
+            return function(ticker, data, *args, **kwargs)
+        counts = self.counts.setdefault(name, [0, 0])
+        if key in self._results:
+            self.hits += 1
+            counts[0] += 1
+            return self._results[key]
+        self.misses += 1
+        counts[1] += 1
+        result = self._results[key] = function(ticker, data, *args, **kwargs)
+        return result
+
+    def clear(self):
+        if self._results:
+            self.evictions += 1
+        self._results = {}
+
+    def summary(self):
+        return {name: {"hits": hits, "misses": misses} for name, (hits, misses) in self.counts.items()}
+
+    def _arguments(self, function, ticker, data, args, kwargs):
+        """Parameters with defaults applied, so ``RSI(t, d, 14)`` and ``RSI(t, d, length=14)`` share a key."""
+        if function not in self._signatures:
+            try:
+                self._signatures[function] = inspect.signature(function)
+            except (TypeError, ValueError):
+                self._signatures[function] = None
+        signature = self._signatures[function]
+        if signature is None:
+            return args, tuple(sorted(kwargs.items()))
+        bound = signature.bind(ticker, data, *args, **kwargs)
+        bound.apply_defaults()
+        return tuple(bound.arguments.items())[2:]
+
+    def _scope(self, date):
+        if date is None:
+            return
+        if self.bar is None or date > self.bar:
+            self.clear()
+            self.bar = date
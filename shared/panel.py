@@ -0,0 +1,294 @@
+import numpy as np
+
+from .dates import MinuteDates
+from .views import OhlcvView
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class OhlcvPanel:
+    """
+    Columnar store for the list-of-dicts OHLCV history handed to strategies.
+
+    Values live in one contiguous float array laid out as (ticker, bar, field),
+    with ``ticker_index`` / ``field_index`` maps to locate a column. Column
+    accessors return views into that array, so ``panel.close("SPY")[-252:]``
+    does not copy. Tickers missing from a bar are stored as NaN.
+
+    Alongside the values the panel keeps a per-ticker validity mask (a bar is
+    valid when the ticker is present with a close), the index of each ticker's
+    first valid bar and, for every bar, the index of the latest valid bar at
+    or before it. Aligned lookbacks such as "close 63 bars ago, carried
+    forward over gaps" are then O(1) via ``value_at``, and ``ffill`` forward
+    fills a whole field in one gather instead of re-filtering lists.
+
+    With ``max_bars`` set the panel keeps a bounded window: storage is a
+    buffer of ``2 * max_bars`` rows and, once full, the newest ``max_bars``
+    rows are moved back to the front. Appends stay amortized O(1), views stay
+    contiguous in the bar axis, and ``start`` counts the bars dropped so far.
+
+    ``compact=True`` stores values as float32, gap indices as int32 and dates
+    as int32 epoch minutes (MinuteDates), roughly halving memory. Precision
+    bounds of the compact mode:
+
+    - every value is rounded to float32, a relative error of at most 2**-24
+      (about 6e-8) per stored value;
+    - prices below 65,536 keep a spacing of 2**-8 or finer, so the original
+      cent value is always the nearest cent;
+    - volumes are exact up to 2**24 (16,777,216) shares per bar and
+      otherwise within the same relative bound;
+    - timestamps keep minute resolution (seconds are dropped) through the
+      year 6053.
+
+    ``precision.compare_allocations`` replays strategies on both modes to
+    check that their allocations agree within ``precision.TOLERANCE``; the
+    resulting bounds on allocations are spelled out in ``precision``.
+    """
+
+    def __init__(self, tickers, fields=FIELDS, capacity=256, dtype=np.float64, max_bars=None, compact=False):
+        if compact:
+            dtype = np.float32
+        if max_bars is not None:
+            max_bars = max(int(max_bars), 1)
+            capacity = 2 * max_bars
+        self.tickers = list(tickers)
+        self.fields = tuple(fields)
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+        self.dtype = np.dtype(dtype)
+        self.compact = compact
+        self.max_bars = max_bars
+        self.start = 0
+        self.dates = self._new_dates()
+        self._length = 0
+        self._values = np.full((len(self.tickers), max(int(capacity), 1), len(self.fields)),
+                               np.nan, dtype=self.dtype)
+        self._valid = np.zeros(self._values.shape[:2], dtype=bool)
+        self._last_valid = np.full(self._values.shape[:2], -1, dtype=self._index_dtype)
+        self.first_valid = np.full(len(self.tickers), -1, dtype=np.int64)
+
+    @property
+    def _index_dtype(self):
+        return np.int32 if self.compact else np.int64
+
+    def _new_dates(self):
+        return MinuteDates() if self.compact else []
+
+    @classmethod
+    def from_ohlcv(cls, ohlcv, tickers=None, fields=FIELDS, dtype=np.float64, max_bars=None, compact=False):
+        """
+        Build a panel from ``data["ohlcv"]``.
+
+        :param ohlcv: List of bars, each a dict of ticker -> OHLCV dict
+        :param tickers: Tickers to keep; defaults to every ticker seen in the history
+        """
+        if tickers is None:
+            tickers = []
+            seen = set()
+            for bar in ohlcv:
+                for ticker in bar:
+                    if ticker not in seen:
+                        seen.add(ticker)
+                        tickers.append(ticker)
+        panel = cls(tickers, fields=fields, capacity=len(ohlcv), dtype=dtype, max_bars=max_bars, compact=compact)
+        panel.extend(ohlcv)
+        return panel
+
+    @classmethod
+    def from_arrays(cls, tickers, values, dates, fields=FIELDS, max_bars=None, compact=False):
+        """
+        Build a panel from a (ticker, bar, field) array, NaN close marking a
+        missing bar, without going through the list-of-dicts form.
+        """
+        values = np.asarray(values)
+        n = values.shape[1]
+        panel = cls(tickers, fields=fields, capacity=n, dtype=values.dtype, max_bars=max_bars, compact=compact)
+        if max_bars is not None and n > max_bars:
+            panel.start = n - max_bars
+            values = values[:, -max_bars:, :]
+            dates = dates[-max_bars:]
+            n = max_bars
+        panel._values[:, :n, :] = values
+        close = panel.field_index.get("close")
+        if close is None:
+            panel._valid[:, :n] = True
+        else:
+            panel._valid[:, :n] = ~np.isnan(values[:, :, close])
+        rows = np.where(panel._valid[:, :n], np.arange(n), -1)
+        panel._last_valid[:, :n] = np.maximum.accumulate(rows, axis=1)
+        panel.first_valid[:] = np.where(panel._valid[:, :n].any(axis=1), panel._valid[:, :n].argmax(axis=1), -1)
+        panel.dates = MinuteDates(dates) if compact else list(dates)
+        panel._length = n
+        return panel
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        return self._values.shape[1]
+
+    @property
+    def bars_total(self):
+        """Number of bars ingested so far, including any dropped from a bounded window."""
+        return self.start + self._length
+
+    @property
+    def values(self):
+        """View of the filled (ticker, bar, field) block."""
+        return self._values[:, :self._length, :]
+
+    def extend(self, bars):
+        bars = list(bars)
+        if self.max_bars is not None and len(bars) > self.max_bars:
+            self.start += self._length + len(bars) - self.max_bars
+            self._length = 0
+            self.dates = self._new_dates()
+            self.first_valid[:] = -1
+            bars = bars[-self.max_bars:]
+        self._reserve(self._length + len(bars))
+        for bar in bars:
+            self._write(self._length, bar)
+            self._length += 1
+
+    def append(self, bar):
+        self._reserve(self._length + 1)
+        self._write(self._length, bar)
+        self._length += 1
+
+    def column(self, ticker, field="close"):
+        """Zero-copy view of one field for one ticker, oldest bar first."""
+        return self._values[self.ticker_index[ticker], :self._length, self.field_index[field]]
+
+    def field(self, field="close"):
+        """Zero-copy (bar, ticker) view of one field across the universe."""
+        return self._values[:, :self._length, self.field_index[field]].T
+
+    def array(self, ticker):
+        """Zero-copy (bar, field) view for one ticker."""
+        return self._values[self.ticker_index[ticker], :self._length, :]
+
+    def date_at(self, row):
+        return self.dates[row]
+
+    def is_valid(self, ticker, row):
+        return bool(self._valid[self.ticker_index[ticker], row])
+
+    def ohlcv(self, tickers=None, stop=None, stats=None):
+        """Lazy read-only ``data["ohlcv"]`` view over the first ``stop`` bars."""
+        return OhlcvView(self, self.tickers if tickers is None else tickers, 0,
+                         self._length if stop is None else stop, stats=stats)
+
+    def valid(self, ticker=None):
+        """Validity mask view for one ticker, or (bar, ticker) for the whole universe."""
+        if ticker is None:
+            return self._valid[:, :self._length].T
+        return self._valid[self.ticker_index[ticker], :self._length]
+
+    def last_valid(self, ticker=None):
+        """Index of the latest valid bar at or before each bar (-1 before the first one)."""
+        if ticker is None:
+            return self._last_valid[:, :self._length].T
+        return self._last_valid[self.ticker_index[ticker], :self._length]
+
+    def first_valid_index(self, ticker):
+        """Index of the ticker's first valid bar, or -1 if it has none yet."""
+        return int(self.first_valid[self.ticker_index[ticker]])
+
+    def value_at(self, ticker, bars_ago=0, field="close"):
+        """
+        ``field`` for ``ticker`` as of ``bars_ago`` bars before the newest bar,
+        carried forward from the latest valid bar; NaN if there is none.
+        """
+        row = self._length - 1 - bars_ago
+        if row < 0:
+            return np.nan
+        t = self.ticker_index[ticker]
+        source = self._last_valid[t, row]
+        if source < 0:
+            return np.nan
+        return self._values[t, source, self.field_index[field]]
+
+    def ffill(self, field="close"):
+        """Forward-filled (bar, ticker) copy of one field; NaN before a ticker's first valid bar."""
+        source = self._last_valid[:, :self._length]
+        filled = np.take_along_axis(self._values[:, :, self.field_index[field]], np.maximum(source, 0), axis=1)
+        filled[source < 0] = np.nan
+        return filled.T
+
+    def open(self, ticker):
+        return self.column(ticker, "open")
+
+    def high(self, ticker):
+        return self.column(ticker, "high")
+
+    def low(self, ticker):
+        return self.column(ticker, "low")
+
+    def close(self, ticker):
+        return self.column(ticker, "close")
+
+    def volume(self, ticker):
+        return self.column(ticker, "volume")
+
+    def clear(self):
+        self.start = 0
+        self._length = 0
+        self.dates = self._new_dates()
+        self.first_valid[:] = -1
+
+    def _reserve(self, size):
+        if size <= self.capacity:
+            return
+        if self.max_bars is not None:
+            keep = min(max(self.max_bars - (size - self._length), 0), self._length)
+            drop = self._length - keep
+            self._values[:, :keep, :] = self._values[:, drop:self._length, :]
+            self._valid[:, :keep] = self._valid[:, drop:self._length]
+            shifted = self._last_valid[:, drop:self._length] - drop
+            self._last_valid[:, :keep] = np.maximum(shifted, -1)
+            first = np.where(self._valid[:, :keep].any(axis=1), self._valid[:, :keep].argmax(axis=1), -1)
+            self.first_valid[:] = first
+            del self.dates[:drop]
+            self.start += drop
+            self._length = keep
+            return
+        capacity = max(size, 2 * self.capacity)
+        grown = np.full((len(self.tickers), capacity, len(self.fields)), np.nan, dtype=self.dtype)
+        grown[:, :self._length, :] = self._values[:, :self._length, :]
+        self._values = grown
+        valid = np.zeros(grown.shape[:2], dtype=bool)
+        valid[:, :self._length] = self._valid[:, :self._length]
+        self._valid = valid
+        last_valid = np.full(grown.shape[:2], -1, dtype=self._index_dtype)
+        last_valid[:, :self._length] = self._last_valid[:, :self._length]
+        self._last_valid = last_valid
+
+    def _write(self, row, bar):
+        self._values[:, row, :] = np.nan
+        self._valid[:, row] = False
+        close = self.field_index.get("close")
+        date = None
+        for ticker, t in self.ticker_index.items():
+            candle = bar.get(ticker)
+            if not candle:
+                continue
+            if date is None:
+                date = candle.get("date")
+            for field, f in self.field_index.items():
+                value = candle.get(field)
+                if value is not None:
+                    self._values[t, row, f] = value
+            self._valid[t, row] = close is None or not np.isnan(self._values[t, row, close])
+        valid = self._valid[:, row]
+        if row:
+            self._last_valid[:, row] = np.where(valid, row, self._last_valid[:, row - 1])
+        else:
+            self._last_valid[:, row] = np.where(valid, row, -1)
+        self.first_valid[valid & (self.first_valid < 0)] = row
+        if date is None and bar:
+            date = next(iter(bar.values())).get("date")
+        if row == len(self.dates):
+            self.dates.append(date)
+        else:
+            self.dates[row] = date
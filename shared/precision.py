@@ -0,0 +1,134 @@
+"""
+Comparison harness for the compact (float32) panel mode.
+
+Replays strategies once on a float64 panel and once on a compact panel built
+from the same HistoryStore and reports every bar where the allocations
+differ by more than a tolerance. Run it over the whole book with::
+
+    python -m shared.precision STORE_DIR [REPO_ROOT [START]]
+
+Precision contract. The compact panel moves every price by at most 2**-24
+relative (see OhlcvPanel), so:
+
+- decisions made by comparisons (crossovers, rankings, thresholds) are the
+  same on both paths unless an input lies within that margin of the
+  threshold;
+- weights that are continuous functions of prices move by their
+  sensitivity times 2**-24. For volatility-based weights (inverse
+  volatility, momentum over volatility) each daily return moves by at most
+  2**-23, so the weights move by at most ``2**-23 / sigma``, ``sigma`` being
+  the smallest daily return deviation involved. That is 1e-3 at
+  ``sigma = 1.2e-4`` (about a cent a day on a $90 T-bill fund); in practice
+  the rounding errors average out and differences are near 1e-6;
+- a strategy rounding its weights to ``d`` decimals can move by one step,
+  ``10**-d``, when a weight sits on a rounding boundary.
+
+``TOLERANCE`` (1e-3 of portfolio weight) is the default tolerance of the
+harness and the agreement the compact mode promises.
+"""
+import glob
+import importlib.util
+import os
+import sys
+from collections.abc import Mapping
+
+from .runner import BookRunner
+from .store import HistoryStore
+
+TOLERANCE = 1e-3
+
+
+def allocation_dict(result):
+    """Weights from a ``run`` result (TargetAllocation, dict or None) as a plain dict."""
+    if result is None:
+        return {}
+    if isinstance(result, Mapping):
+        return dict(result)
+    for name in ("target_allocation", "allocation", "allocations"):
+        value = getattr(result, name, None)
+        if isinstance(value, Mapping):
+            return dict(value)
+    return dict(vars(result))
+
+
+def _max_difference(a, b):
+    a, b = allocation_dict(a), allocation_dict(b)
+    return max((abs((a.get(k) or 0) - (b.get(k) or 0)) for k in set(a) | set(b)), default=0.0)
+
+
+def compare_allocations(factory, store, start=1, stop=None, tolerance=TOLERANCE, data_loader=None):
+    """
+    Replay one strategy on the float64 and compact paths.
+
+    :param factory: Zero-argument callable returning a fresh strategy instance
+    :param store: HistoryStore covering the strategy's assets
+    :param data_loader: Passed to BookRunner for strategies declaring datasets
+    :return: List of ``(bar, max_weight_difference)`` for bars over ``tolerance``
+    """
+    results = []
+    for compact in (False, True):
+        runner = BookRunner([factory()], lambda interval, tickers: store.to_panel(tickers, compact=compact),
+                            data_loader=data_loader)
+        results.append(runner.run(start=start, stop=stop)[0])
+    mismatches = []
+    for bar, (wide, narrow) in enumerate(zip(*results), start):
+        difference = _max_difference(wide, narrow)
+        if difference > tolerance:
+            mismatches.append((bar, difference))
+    return mismatches
+
+
+def load_strategies(root, failures=None):
+    """
+    Map of strategy directory -> factory for every ``*/main.py`` defining TradingStrategy.
+
+    :param failures: Optional dict filled with directory -> exception for files that fail to import
+    """
+    factories = {}
+    for path in sorted(glob.glob(os.path.join(root, "*", "main.py"))):
+        name = os.path.basename(os.path.dirname(path))
+        spec = importlib.util.spec_from_file_location("strategy_" + name.replace("-", "_"), path)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            if failures is not None:
+                failures[name] = e
+            continue
+        if hasattr(module, "TradingStrategy"):
+            factories[name] = module.TradingStrategy
+    return factories
+
+
+def compare_book(root, store, start=1, stop=None, tolerance=TOLERANCE, data_loader=None):
+    """
+    Run ``compare_allocations`` for every strategy whose assets the store covers.
+
+    :return: Dict of strategy directory -> mismatch list, or a string saying
+        why it was not compared ("not loaded: ...", "missing ...", "failed: ...")
+    """
+    failures = {}
+    factories = load_strategies(root, failures)
+    report = {name: "not loaded: %s" % e for name, e in failures.items()}
+    for name, factory in factories.items():
+        missing = [ticker for ticker in factory().assets if ticker not in store.ticker_index]
+        if missing:
+            report[name] = "missing %s" % ", ".join(missing)
+            continue
+        try:
+            report[name] = compare_allocations(factory, store, start=start, stop=stop, tolerance=tolerance,
+                                               data_loader=data_loader)
+        except Exception as e:
+            report[name] = "failed: %s" % e
+    return report
+
+
+if __name__ == "__main__":
+    store = HistoryStore(sys.argv[1])
+    root = sys.argv[2] if len(sys.argv) > 2 else os.getcwd()
+    start = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    for name, outcome in sorted(compare_book(root, store, start=start).items()):
+        if isinstance(outcome, list):
+            outcome = "ok" if not outcome else "%d bars differ, worst %.3g" % (
+                len(outcome), max(d for _, d in outcome))
+        print("%s: %s" % (name, outcome))
@@ -0,0 +1,83 @@
+import bisect
+import math
+from collections import deque
+
+import numpy as np
+
+
+class RollingQuantile:
+    """
+    Sorted window answering quantiles of the last ``window`` values.
+
+    ``update(x)`` inserts the new value and drops the oldest one with a binary
+    search each (plus a list memmove), so no bar re-sorts the history;
+    ``window=None`` keeps every value (expanding). ``quantile`` and
+    ``percentile`` then read the sorted values directly and interpolate
+    linearly exactly as ``np.quantile`` / ``np.percentile`` do.
+
+    NaN values occupy their slot in the window but are not sorted. As with
+    ``np.percentile`` any NaN in the window makes the result NaN, unless
+    ``skipna=True`` (the ``Series.quantile`` behaviour).
+    """
+
+    def __init__(self, window=None, skipna=False):
+        self.window = window
+        self.skipna = skipna
+        self.reset()
+
+    def reset(self):
+        self.sorted = []
+        self.nans = 0
+        self._values = deque()
+
+    def __len__(self):
+        return len(self._values)
+
+    def update(self, x):
+        if self.window is not None and len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(x)
+        if x != x:
+            self.nans += 1
+        else:
+            bisect.insort(self.sorted, x)
+        return self
+
+    def extend(self, values):
+        for x in values:
+            self.update(x)
+        return self
+
+    def quantile(self, q):
+        """
+        Quantile(s) ``q`` in [0, 1] with linear interpolation.
+
+        :param q: A float or a sequence of floats
+        :return: A float, or an array for a sequence
+        """
+        if np.ndim(q):
+            return np.array([self._quantile(float(p)) for p in q])
+        return self._quantile(float(q))
+
+    def percentile(self, p):
+        """``np.percentile`` over the window; ``p`` in [0, 100]."""
+        return self.quantile(np.true_divide(p, 100))
+
+    def _remove(self, x):
+        if x != x:
+            self.nans -= 1
+        else:
+            del self.sorted[bisect.bisect_left(self.sorted, x)]
+
+    def _quantile(self, q):
+        n = len(self.sorted)
+        if not n or (self.nans and not self.skipna):
+            return math.nan
+        position = (n - 1) * q
+        below = math.floor(position)
+        above = min(below + 1, n - 1)
+        t = position - below
+        a, b = self.sorted[int(below)], self.sorted[int(above)]
+        difference = b - a
+        # np.lerp: interpolate from whichever end is nearer
+        return b - difference * (1 - t) if t >= 0.5 else a + difference * t
@@ -0,0 +1,62 @@
+import numpy as np
+
+from .kernels import RollingRegression, TickerBank
+
+
+class RegressionBank(TickerBank):
+    """
+    Rolling least-squares fits of one field for every ticker and window, fed by an OhlcvIngestor.
+
+    Each watched window keeps one RollingRegression over whole rows of the
+    panel, so a new bar updates the running sums of every ticker in a few
+    array operations, independent of the window length. ``slope``,
+    ``intercept``, ``r2`` and ``curvature`` (the second derivative of a
+    parabola fit) then read the latest fit for one ticker or, with
+    ``ticker=None``, an array in ``ticker_index`` order. A window containing
+    a bar where the ticker is missing gives NaN, as ``rolling_regression``.
+
+    Unlike ``Slope(ticker, ohlcv, length)``, the change over ``length`` bars
+    divided by ``length``, the slope is fitted through every bar of the
+    window; for ``length=2`` the two agree. A window watched after
+    subscribing is first fed the bars the panel holds.
+    """
+
+    def __init__(self, tickers=None, windows=(), field="close"):
+        super().__init__(tickers, field)
+        self.windows = list(windows)
+        self._fits = {}
+        self._panel = None
+
+    def watch(self, length):
+        if length not in self.windows:
+            self.windows.append(length)
+            if self._panel is not None:
+                self._fits[length] = RollingRegression(length)
+                self._append(self._panel, 0, [self._fits[length]])
+        return self
+
+    def slope(self, length, ticker=None):
+        return self._read(length, ticker, "slope")
+
+    def intercept(self, length, ticker=None):
+        """Fitted value at the first bar of the window."""
+        return self._read(length, ticker, "intercept")
+
+    def r2(self, length, ticker=None):
+        return self._read(length, ticker, "r2")
+
+    def curvature(self, length, ticker=None):
+        return self._read(length, ticker, "curvature")
+
+    def _read(self, length, ticker, key):
+        values = np.broadcast_to(getattr(self._fits[length], key), (len(self.ticker_index),))
+        return values if ticker is None else float(values[self.ticker_index[ticker]])
+
+    def _rebuild(self, panel):
+        self._fits = {length: RollingRegression(length) for length in self.windows}
+
+    def _append(self, panel, first, fits=None):
+        self._panel = panel
+        for row_values in self._rows(panel, first):
+            for fit in self._fits.values() if fits is None else fits:
+                fit.update(row_values)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from .kernels import RowBuffer, TickerBank
+
+
+class ReturnsBank(TickerBank):
+    """
+    Log prices of a universe, answering k-bar returns for every ticker at once.
+
+    The bank is an OhlcvIngestor subscriber keeping a (bar, ticker) array of
+    log closes, carried forward over bars where a ticker is missing and NaN
+    before its first valid bar. ``returns(horizons)`` gathers the rows
+    ``horizons`` bars back in one indexing operation and returns a (ticker,
+    horizon) matrix, and ``composite(weights)`` collapses it into one score
+    per ticker, so momentum ranking and gating run on arrays instead of
+    per-ticker Python calls. A horizon of ``k`` compares the newest bar with
+    the bar ``k`` bars before it (``prices[-1] / prices[-1 - k] - 1``).
+
+    With ``max_horizon`` set only the rows that horizon needs are kept
+    (storage is compacted like a bounded OhlcvPanel), so the bank can
+    follow a bounded panel. ``start`` counts the rows dropped.
+    """
+
+    def __init__(self, tickers=None, field="close", max_horizon=None):
+        super().__init__(tickers, field)
+        self.max_horizon = max_horizon
+        self._log = RowBuffer((len(self.ticker_index),), self._kept())
+
+    def __len__(self):
+        return len(self._log)
+
+    @property
+    def start(self):
+        return self._log.start
+
+    @property
+    def log_prices(self):
+        """View of the (bar, ticker) log price block."""
+        return self._log.values
+
+    def returns(self, horizons, bars_ago=0, clamp=False, log=False):
+        """
+        Returns over each horizon for every ticker.
+
+        :param horizons: A horizon in bars or a sequence of them
+        :param bars_ago: Measure up to this many bars before the newest bar
+        :param clamp: Measure horizons longer than the history from the
+            oldest bar held instead of returning NaN
+        :param log: Return log returns instead of simple returns
+        :return: (ticker, horizon) array; NaN where a price is unavailable
+        """
+        horizons = np.atleast_1d(np.asarray(horizons, dtype=np.int64))
+        now = len(self._log) - 1 - bars_ago
+        if now < 0:
+            return np.full((len(self.ticker_index), len(horizons)), np.nan)
+        then = now - horizons
+        if clamp:
+            then = np.maximum(then, 0)
+        available = then >= 0
+        log_prices = self._log.values
+        change = log_prices[now] - log_prices[np.where(available, then, 0)]
+        change[~available] = np.nan
+        change = change.T
+        return change if log else np.expm1(change)
+
+    def composite(self, weights, fill=np.nan, bars_ago=0, clamp=False):
+        """
+        Weighted sum of returns per ticker, e.g. ``{21: 0.35, 63: 0.35, 126: 0.30}``.
+
+        :param fill: Value used for unavailable returns (0 treats them as flat)
+        :return: Array of scores in ``ticker_index`` order
+        """
+        horizons = list(weights)
+        matrix = self.returns(horizons, bars_ago=bars_ago, clamp=clamp)
+        if fill is not None and not np.isnan(fill):
+            matrix = np.where(np.isnan(matrix), fill, matrix)
+        return matrix @ np.array([weights[h] for h in horizons], dtype=np.float64)
+
+    def _rebuild(self, panel):
+        self._log = RowBuffer((len(self.ticker_index),), self._kept(), capacity=max(len(panel), 256))
+        self._log.start = panel.start
+
+    def _append(self, panel, first):
+        count = len(panel) - first
+        if count <= 0:
+            return
+        block = self._block(panel, first)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block = np.log(np.where(block > 0, block, np.nan))
+        previous = self._log.values[-1] if len(self._log) else np.full(len(self._columns), np.nan)
+        stacked = np.vstack([previous, block])
+        rows = np.where(np.isnan(stacked), 0, np.arange(count + 1)[:, None])
+        rows = np.maximum.accumulate(rows, axis=0)
+        self._log.extend(stacked[rows, np.arange(stacked.shape[1])][1:])
+
+    def _kept(self):
+        return self.max_horizon + 1 if self.max_horizon is not None else None
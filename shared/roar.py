@@ -0,0 +1,259 @@
+"""
+Incremental ROAR score for the SPY/BIL timing strategy.
+
+The strategy recomputes 20/50/150-bar moving averages, their slopes and
+accelerations, 512-bar slope quantiles, realized-volatility deciles and four
+return horizons over the whole history on every rebalance day.
+``RoarScoreEngine`` keeps all of these as running state, so each bar costs
+the same regardless of history length, and reproduces the strategy's
+numbers exactly (rolling means and deviations follow pandas' own update
+order, quantiles follow ``np.percentile``).
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+from .dates import to_epoch_day
+from .kernels import RollingMean, RollingVariance
+from .quantiles import RollingQuantile
+
+PERIODS = (20, 50, 150)
+WARMUP = 175
+STRENGTH_THRESHOLDS = {20: (-0.02, 0.03, 0.05, 0.08), 50: (-0.05, 0.04, 0.08, 0.12), 150: (-0.05, 0.05, 0.10, 0.15)}
+MA_SCORES = {"Buy": 5, "Hold": 2, "Sell": 0}
+DIRECTION_SCORES = {
+    "Buy": {"Strongest": 5, "Strengthening": 4, "Average": 2, "Weakening": 1, "Weakest": 0},
+    "Hold": {"Strongest": 3, "Strengthening": 2, "Average": 2, "Weakening": 1, "Weakest": 0},
+    "Sell": {"Strongest": 0, "Strengthening": 0, "Average": 0, "Weakening": 1, "Weakest": 2},
+}
+STRENGTH_SCORES = {
+    "Buy": {"Maximum": 5, "Strong": 4, "Average": 2, "Soft": 1, "Weak": 0},
+    "Sell": {"Maximum": 0, "Strong": 0, "Average": 1, "Soft": 1, "Weak": 2},
+}
+
+
+def _nanmean(values):
+    """``Series.mean()``: NaN-skipping mean summed the way pandas sums."""
+    values = np.array(values)
+    valid = values == values
+    count = valid.sum()
+    return np.where(valid, values, 0.0).sum() / count if count else math.nan
+
+
+class _Trend:
+    """One moving average with the recent values and slope window its ratings need."""
+
+    def __init__(self, period):
+        self.period = period
+        self.mean = RollingMean(period)
+        self.recent = deque([math.nan] * 5, maxlen=5)
+        self.count = 0
+        self.slopes = RollingQuantile(512)
+
+    def update(self, close):
+        ma = self.mean.update(close)
+        self.recent.append(ma)
+        if ma == ma:
+            self.count += 1
+            slope = ma - self.recent[-2]
+            if slope == slope:
+                self.slopes.update(slope)
+
+    def _motion(self):
+        m = self.recent
+        slopes = [m[i] - m[i - 1] for i in range(1, 5)]
+        accels = [slopes[i] - slopes[i - 1] for i in range(1, 4)]
+        return slopes[-1], accels[-1], accels
+
+    def rating(self):
+        if self.count < 10:
+            return "Hold"
+        slope, accel, accels = self._motion()
+        if slope != slope or accel != accel:
+            return "Hold"
+        recent = _nanmean(accels)
+        if slope > 0.1 and accel > 0.05 and recent > 0:
+            return "Buy"
+        if slope < -0.1 or (accel < -0.05 and recent < -0.02):
+            return "Sell"
+        return "Hold"
+
+    def direction(self):
+        if self.count < self.period:
+            return "Average"
+        slope, accel, _ = self._motion()
+        if slope != slope or accel != accel:
+            return "Average"
+        # Series.quantile goes through np.percentile(values, q * 100)
+        strong = self.slopes.percentile(0.65 * 100.0)
+        weak = self.slopes.percentile(0.35 * 100.0)
+        if slope > strong:
+            return "Strongest"
+        if slope < weak and accel < -0.05:
+            return "Weakest"
+        if slope < weak and accel > 0.05:
+            return "Strengthening"
+        return "Average"
+
+
+class RoarScoreEngine:
+    """
+    Running ROAR score fed one close (and date) at a time.
+
+    ``update(close, date)`` advances every statistic in constant time and
+    sets ``raw`` (the unsmoothed score from the strategy's formula, NaN
+    before ``WARMUP`` bars). On rebalance bars (the weekday ``rebalance_day``,
+    or every bar when it is None) the raw score joins the last ``smoothing``
+    ones, and ``smoothed`` and ``allocation`` are refreshed; in between they
+    hold their previous values, as in the strategy.
+
+    The engine can also subscribe to an OhlcvIngestor and follow ``ticker``.
+    ``compare_with_strategy`` replays a strategy next to the engine to check
+    that allocations agree bar for bar.
+    """
+
+    def __init__(self, ticker="SPY", cash="BIL", rebalance_day=1, smoothing=10,
+                 vol_window=15, vol_lookback=126):
+        self.ticker = ticker
+        self.cash = cash
+        self.rebalance_day = rebalance_day
+        self.smoothing = smoothing
+        self.vol_window = vol_window
+        self.vol_lookback = vol_lookback
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.raw = math.nan
+        self.smoothed = math.nan
+        self.allocation = {self.ticker: 0.0, self.cash: 1.0}
+        self.scores = deque(maxlen=self.smoothing)
+        self._trends = {period: _Trend(period) for period in PERIODS}
+        self._closes = deque(maxlen=max(PERIODS) + 1)
+        self._variance = RollingVariance(self.vol_window)
+        self._vol_count = 0
+        self._vol_history = RollingQuantile(self.vol_lookback, skipna=True)
+
+    def update(self, close, date=None):
+        """
+        Feed the next close; ``date`` ("%Y-%m-%d ..." or epoch day) drives the weekday schedule.
+
+        :return: The current ``allocation``
+        """
+        previous = self._closes[-1] if self._closes else None
+        self._closes.append(close)
+        self.count += 1
+        for trend in self._trends.values():
+            trend.update(close)
+        vol = self._update_vol(previous, close)
+        if self.count >= WARMUP:
+            self.raw = self._raw_score(vol)
+            if self.rebalance_day is None or (date is not None
+                                              and (to_epoch_day(date) + 3) % 7 == self.rebalance_day):
+                self._rebalance()
+        self._vol_history.update(vol)
+        return self.allocation
+
+    def on_rebuild(self, panel):
+        self.reset()
+        self._feed(panel, 0)
+
+    def on_append(self, panel, count):
+        self._feed(panel, max(len(panel) - count, 0))
+
+    def _feed(self, panel, first):
+        if self.ticker not in panel.ticker_index:
+            return
+        closes = panel.close(self.ticker)
+        valid = panel.valid(self.ticker)
+        for row in range(first, len(panel)):
+            if valid[row]:
+                self.update(float(closes[row]), panel.dates[row])
+
+    def _update_vol(self, previous, close):
+        change = math.nan if previous is None else close / previous - 1
+        self._variance.update(change)
+        vol = self._variance.std * np.sqrt(252)
+        if vol == vol:
+            self._vol_count += 1
+        return vol
+
+    def _vol_score(self, vol):
+        if self._vol_count < self.vol_lookback:
+            return 0.0
+        if vol != vol or len(self._vol_history.sorted) < 20:
+            return 0.0
+        deciles = self._vol_history.percentile(np.arange(0.1, 1.0, 0.1) * 100.0)
+        rank = sum(vol > decile for decile in deciles)
+        return 10 - (rank * (20 / 9))
+
+    def _strength(self, period):
+        if len(self._closes) < period + 1:
+            return "Average"
+        pct = (self._closes[-1] / self._closes[-(period + 1)]) - 1
+        thresholds = STRENGTH_THRESHOLDS[period]
+        if pct != pct or (thresholds[1] < pct <= thresholds[2]):
+            return "Average"
+        if pct <= thresholds[0]:
+            return "Weak"
+        if pct <= thresholds[1]:
+            return "Soft"
+        if pct <= thresholds[3]:
+            return "Strong"
+        return "Maximum"
+
+    def _components(self, period):
+        trend = self._trends[period]
+        rating = trend.rating()
+        direction = trend.direction()
+        strength = self._strength(period)
+        return (MA_SCORES[rating], DIRECTION_SCORES[rating][direction],
+                STRENGTH_SCORES["Sell" if rating == "Sell" else "Buy"][strength])
+
+    def _raw_score(self, vol):
+        ma_20, dir_20, str_20 = self._components(20)
+        ma_50, dir_50, str_50 = self._components(50)
+        ma_150, dir_150, str_150 = self._components(150)
+        score_vol = self._vol_score(vol)
+        closes = self._closes
+        blend = (closes[-1] / closes[-6] - 1 + (closes[-1] / closes[-11] - 1)
+                 + (closes[-1] / closes[-21] - 1) + (closes[-1] / closes[-51] - 1)) / 4
+        weighted = (
+            ma_20 * 0.12 + dir_20 * 0.12 + str_20 * 0.08 +
+            score_vol * 0.10 +
+            ma_50 * 0.12 + dir_50 * 0.12 + str_50 * 0.08 +
+            ma_150 * 0.08 + dir_150 * 0.05 + str_150 * 0.05
+        )
+        return (weighted * 25) - (blend * 100)
+
+    def _rebalance(self):
+        self.scores.append(self.raw)
+        self.smoothed = np.mean(self.scores)
+        weight = np.clip(self.smoothed / 100.0, 0.0, 1.0)
+        self.allocation = {self.ticker: float(weight), self.cash: float(1.0 - weight)}
+
+
+def compare_with_strategy(strategy, ohlcv, engine=None, start=1, stop=None):
+    """
+    Replay ``strategy`` on growing slices of ``ohlcv`` next to an engine.
+
+    :param strategy: A fresh strategy instance whose ``run`` returns the ROAR allocation
+    :return: List of ``(bar, strategy_allocation, engine_allocation)`` where they differ
+    """
+    from .precision import allocation_dict
+
+    engine = engine if engine is not None else RoarScoreEngine()
+    stop = len(ohlcv) if stop is None else stop
+    mismatches = []
+    for n in range(1, stop + 1):
+        candle = ohlcv[n - 1].get(engine.ticker)
+        expected = engine.allocation
+        if candle:
+            expected = engine.update(candle["close"], candle["date"])
+        if n < start:
+            continue
+        actual = allocation_dict(strategy.run({"ohlcv": ohlcv[:n], "holdings": {}}))
+        if actual != expected:
+            mismatches.append((n, actual, dict(expected)))
+    return mismatches
@@ -0,0 +1,121 @@
+from .lazy import AccessStats
+from .trading_calendar import TradingCalendar
+
+
+class BookRunner:
+    """
+    Replays a book of strategies over shared market data.
+
+    Strategies are grouped by their ``interval`` and the union of their
+    ``assets`` is loaded once per interval through ``loader(interval,
+    tickers)``, which returns a HistoryStore or OhlcvPanel. Each strategy is
+    handed a lazy, read-only ``data["ohlcv"]`` view restricted to its own
+    tickers, so loading scales with unique tickers rather than strategies x
+    tickers.
+
+    Extra datasets declared through a strategy's ``data`` property are looked
+    up with ``data_loader(key, date)`` when given, ``key`` being ``tuple(source)``
+    as used by the strategies (e.g. ``("median_cpi",)``).
+
+    Every candle a strategy reads is counted in ``stats[i]`` (an AccessStats),
+    showing which of its declared tickers it actually needs.
+
+    A strategy exposing ``max_lookback`` receives only its last ``max_lookback``
+    bars (a zero-copy slice of the view), so its per-bar cost does not grow
+    with the backtest. Statistics it needs over the whole history are
+    declared through an ``aggregates`` property mapping names to running
+    aggregates (see ``aggregates``), including ``SeriesAggregate`` for
+    statistics of a derived series. They are reset at the start of every
+    ``run``, fed every bar and passed as ``data["aggregates"]``, a dict of
+    name -> current value.
+
+    A strategy exposing a ``rebalance_schedule`` (see ``trading_calendar``)
+    only has ``run`` called on bars where the schedule fires; on other bars
+    its previous result is reused.
+    """
+
+    def __init__(self, strategies, loader, data_loader=None):
+        self.strategies = list(strategies)
+        self.loader = loader
+        self.data_loader = data_loader
+        self.sources = {}
+        self.calendars = {}
+        self.calls = [0] * len(self.strategies)
+        self.stats = [AccessStats() for _ in self.strategies]
+        self.aggregates = []
+        self._fed = []
+
+    def universes(self):
+        """Union of the strategies' assets for each interval, in first-seen order."""
+        universes = {}
+        for strategy in self.strategies:
+            tickers = universes.setdefault(strategy.interval, [])
+            for ticker in strategy.assets:
+                if ticker not in tickers:
+                    tickers.append(ticker)
+        return universes
+
+    def load(self):
+        for interval, tickers in self.universes().items():
+            if interval not in self.sources:
+                source = self.loader(interval, tickers)
+                self.sources[interval] = source
+                self.calendars[interval] = TradingCalendar(source.dates)
+        return self.sources
+
+    def run(self, start=1, stop=None):
+        """
+        Call every strategy once per bar and collect the results.
+
+        :param start: Number of bars in the first history handed to the strategies
+        :param stop: Number of bars in the last one; defaults to the full history
+        :return: One list of ``run`` results per strategy, in bar order
+        """
+        self.load()
+        self._reset_aggregates()
+        results = [[] for _ in self.strategies]
+        for interval, source in self.sources.items():
+            calendar = self.calendars[interval]
+            members = [i for i, strategy in enumerate(self.strategies) if strategy.interval == interval]
+            last = len(calendar) if stop is None else stop
+            for n in range(start, last + 1):
+                for i in members:
+                    strategy = self.strategies[i]
+                    schedule = getattr(strategy, "rebalance_schedule", None)
+                    if schedule is not None and results[i] and not calendar.is_rebalance(schedule, n - 1):
+                        results[i].append(results[i][-1])
+                        continue
+                    self.stats[i].begin_bar(n)
+                    results[i].append(strategy.run(self._data(i, source, n)))
+                    self.calls[i] += 1
+        return results
+
+    def _data(self, i, source, n):
+        strategy = self.strategies[i]
+        ohlcv = source.ohlcv(strategy.assets, stop=n, stats=self.stats[i])
+        lookback = getattr(strategy, "max_lookback", None)
+        if lookback:
+            ohlcv = ohlcv[-lookback:]
+        data = {"ohlcv": ohlcv, "holdings": {}}
+        if self.aggregates[i]:
+            self._feed(i, source, n)
+            data["aggregates"] = {name: aggregate.value for name, aggregate in self.aggregates[i].items()}
+        if self.data_loader is not None:
+            date = source.date_at(n - 1)
+            for dataset in getattr(strategy, "data", None) or []:
+                key = tuple(dataset)
+                data[key] = self.data_loader(key, date)
+        return data
+
+    def _reset_aggregates(self):
+        self.aggregates = [getattr(strategy, "aggregates", None) or {} for strategy in self.strategies]
+        for aggregates in self.aggregates:
+            for aggregate in aggregates.values():
+                aggregate.reset()
+        self._fed = [0] * len(self.strategies)
+
+    def _feed(self, i, source, n):
+        for row in range(self._fed[i], n):
+            for aggregate in self.aggregates[i].values():
+                aggregate.feed(source, row)
+        self._fed[i] = n
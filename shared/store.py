@@ -0,0 +1,109 @@
+import json
+import os
+
+import numpy as np
+
+from .panel import FIELDS, OhlcvPanel
+from .views import OhlcvView
+
+MANIFEST = "manifest.json"
+DATES = "dates.npy"
+
+
+def _date_strings(seconds):
+    stamps = np.asarray(seconds, dtype=np.int64).astype("datetime64[s]").astype(str)
+    return np.char.replace(stamps, "T", " ").tolist()
+
+
+class HistoryStore:
+    """
+    On-disk OHLCV history for local replays.
+
+    A store is a directory holding one ``<ticker>.npy`` file per ticker with
+    a fixed-dtype (bar, field) array, a ``dates.npy`` file of epoch seconds
+    and a small ``manifest.json``. Files are opened with ``np.load(...,
+    mmap_mode="r")``, so opening a store costs milliseconds regardless of its
+    size and worker processes replaying the same store share page-cache
+    pages. A NaN close marks a ticker missing from a bar.
+
+    ``ohlcv()`` presents the store through the ``data["ohlcv"]`` list-of-dicts
+    interface, materializing bars only when they are read, for strategies
+    that have not been ported to the panel.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST)) as f:
+            manifest = json.load(f)
+        self.tickers = manifest["tickers"]
+        self.fields = tuple(manifest["fields"])
+        self.dtype = np.dtype(manifest["dtype"])
+        self.length = manifest["length"]
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.field_index = {field: i for i, field in enumerate(self.fields)}
+        self.seconds = np.load(os.path.join(path, DATES), mmap_mode="r")
+        self._arrays = {}
+
+    @classmethod
+    def write(cls, path, ohlcv, tickers=None, fields=FIELDS, dtype=np.float64):
+        """
+        Write a history to ``path`` and open it.
+
+        :param ohlcv: An OhlcvPanel, or ``data["ohlcv"]`` in list-of-dicts form
+        """
+        if isinstance(ohlcv, OhlcvPanel):
+            panel = ohlcv
+        else:
+            panel = OhlcvPanel.from_ohlcv(ohlcv, tickers=tickers, fields=fields, dtype=dtype)
+        os.makedirs(path, exist_ok=True)
+        for ticker, t in panel.ticker_index.items():
+            np.save(os.path.join(path, ticker + ".npy"), np.ascontiguousarray(panel.values[t], dtype=dtype))
+        seconds = np.array(panel.dates, dtype="datetime64[s]").astype(np.int64)
+        np.save(os.path.join(path, DATES), seconds)
+        manifest = {
+            "tickers": panel.tickers,
+            "fields": list(panel.fields),
+            "dtype": np.dtype(dtype).name,
+            "length": len(panel),
+        }
+        with open(os.path.join(path, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+        return cls(path)
+
+    def __len__(self):
+        return self.length
+
+    def array(self, ticker):
+        """Read-only memory-mapped (bar, field) array for one ticker."""
+        if ticker not in self._arrays:
+            self._arrays[ticker] = np.load(os.path.join(self.path, ticker + ".npy"), mmap_mode="r")
+        return self._arrays[ticker]
+
+    def column(self, ticker, field="close"):
+        return self.array(ticker)[:, self.field_index[field]]
+
+    @property
+    def dates(self):
+        return self.date_range()
+
+    def date_range(self, start=0, stop=None):
+        return _date_strings(self.seconds[start:stop])
+
+    def date_at(self, row):
+        return _date_strings(self.seconds[row:row + 1])[0]
+
+    def is_valid(self, ticker, row):
+        close = self.field_index.get("close")
+        return close is None or not np.isnan(self.array(ticker)[row, close])
+
+    def to_panel(self, tickers=None, start=0, stop=None, max_bars=None, compact=False):
+        """Copy a bar range of some or all tickers into an OhlcvPanel."""
+        tickers = list(self.tickers if tickers is None else tickers)
+        values = np.stack([self.array(ticker)[start:stop] for ticker in tickers])
+        return OhlcvPanel.from_arrays(tickers, values, self.date_range(start, stop), fields=self.fields,
+                                      max_bars=max_bars, compact=compact)
+
+    def ohlcv(self, tickers=None, stop=None, stats=None):
+        """Lazy ``data["ohlcv"]`` view over the first ``stop`` bars."""
+        return OhlcvView(self, self.tickers if tickers is None else tickers, 0,
+                         self.length if stop is None else stop, stats=stats)
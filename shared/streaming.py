@@ -0,0 +1,733 @@
+import math
+import sys
+from collections import deque
+from collections.abc import Mapping
+
+from .dates import DateIndex, from_epoch_day, to_epoch_day
+from .kernels import RollingExtreme, RollingHma, RollingVariance, RollingWma
+
+NAN = float("nan")
+
+
+def _div(a, b):
+    """``a / b`` with float semantics (inf or NaN) instead of ZeroDivisionError."""
+    if b == 0:
+        return NAN if a == 0 or a != a else math.copysign(math.inf, a)
+    return a / b
+
+
+class _Ewm:
+    """
+    ``Series.ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean()``
+    computed one value at a time, following pandas' recurrence step for step.
+    """
+
+    def __init__(self, alpha, adjust=True, min_periods=0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self.nobs = 0
+        self._weighted = NAN
+        self._old_wt = 1.0
+
+    def update(self, x):
+        observed = x == x
+        self.nobs += observed
+        if self._weighted == self._weighted:
+            self._old_wt *= 1.0 - self.alpha
+            if observed:
+                new_wt = 1.0 if self.adjust else self.alpha
+                if self._weighted != x:
+                    self._weighted = (self._old_wt * self._weighted + new_wt * x) / (self._old_wt + new_wt)
+                self._old_wt = self._old_wt + new_wt if self.adjust else 1.0
+        elif observed:
+            self._weighted = x
+        return self._weighted if self.nobs >= self.min_periods else NAN
+
+
+def _rma(length):
+    """Wilder smoothing as used by RSI, ATR and ADX."""
+    return _Ewm(1.0 / length, adjust=True, min_periods=length)
+
+
+class _Ema:
+    """EMA seeded with the SMA of its first ``length`` values (NaN until then)."""
+
+    def __init__(self, length):
+        self.length = length
+        self._seed = []
+        self._ewm = _Ewm(2.0 / (length + 1), adjust=False)
+
+    def update(self, x):
+        if self._seed is not None:
+            self._seed.append(x)
+            if len(self._seed) < self.length:
+                return NAN
+            x = sum(self._seed) / self.length
+            self._seed = None
+        return self._ewm.update(x)
+
+
+class _Window:
+    """Last ``length`` values with a running sum, re-summed exactly every ``length`` pushes."""
+
+    def __init__(self, length):
+        self.length = length
+        self.values = deque()
+        self.total = 0.0
+        self._pushes = 0
+
+    @property
+    def full(self):
+        return len(self.values) == self.length
+
+    @property
+    def mean(self):
+        return self.total / self.length if self.full else NAN
+
+    def push(self, x):
+        if self.full:
+            self.total -= self.values.popleft()
+        self.values.append(x)
+        self.total += x
+        self._pushes += 1
+        if self._pushes % self.length == 0:
+            self.total = math.fsum(self.values)
+        return self
+
+
+class StreamingIndicator:
+    """
+    Stateful counterpart of a ``surmount.technical_indicators`` function.
+
+    Subclasses carry the function's name and parameters (``RSI("QQQ", 14)``
+    for ``RSI("QQQ", data, 14)``) and keep running state (rolling sums,
+    Wilder smoothing, EMA carry, PSAR state) so that each new bar is an O(1)
+    ``update(candle)`` instead of a pass over the whole history. ``value``
+    is what ``batch(...)[-1]`` returns: a float, NaN during warm-up, or a
+    dict of floats for indicators returning several lines.
+
+    Indicators are OhlcvIngestor subscribers: ``ingestor.subscribe(RSI("QQQ",
+    14))`` warms the indicator up from the panel and then feeds it each
+    appended bar, including after bars have dropped out of a bounded window.
+    ``warm_up(ohlcv)`` feeds a ``data["ohlcv"]`` slice directly. Bars where the
+    ticker is missing are skipped.
+
+    With ``verify=True`` the indicator checks itself against the batch
+    function after every panel update (see ``check``); replaying a history
+    through an unbounded ingestor that way asserts bar-by-bar equality.
+    Indicators without a batch counterpart set ``verifiable = False`` and
+    refuse ``verify=True``.
+    """
+
+    batch = None
+    verifiable = True
+
+    def __init__(self, ticker, params, verify=False):
+        if verify and not self.verifiable:
+            raise ValueError("%s has no batch function to verify against" % type(self).__name__)
+        self.ticker = ticker
+        self.params = params
+        self.verify = verify
+        self.rtol = 1e-9
+        self.atol = 1e-9
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.value = self._blank()
+        self._reset()
+
+    def update(self, candle):
+        """Feed one bar's OHLCV dict for the ticker (None when missing) and return ``value``."""
+        if not candle or candle.get("close") is None or candle["close"] != candle["close"]:
+            return self.value
+        self.value = self._step(candle)
+        self.count += 1
+        return self.value
+
+    def warm_up(self, ohlcv):
+        for bar in ohlcv:
+            self.update(bar.get(self.ticker))
+        if self.verify:
+            self.check(ohlcv)
+        return self.value
+
+    def on_rebuild(self, panel):
+        self.reset()
+        self._feed(panel, 0)
+
+    def on_append(self, panel, count):
+        self._feed(panel, max(len(panel) - count, 0))
+
+    def check(self, ohlcv, batch=None):
+        """
+        Assert that ``value`` equals the batch function's latest value.
+
+        :param ohlcv: The full history fed so far, in ``data["ohlcv"]`` form
+        :param batch: Batch function; defaults to the one of the same name in
+            ``surmount.technical_indicators``
+        """
+        if batch is None:
+            from surmount import technical_indicators
+            batch = getattr(technical_indicators, self.batch or type(self).__name__)
+        expected = batch(self.ticker, ohlcv, **self.params)
+        if isinstance(expected, Mapping):
+            expected = {key: values[-1] if values else None for key, values in expected.items()}
+            actual = self.value if isinstance(self.value, Mapping) else {}
+            mismatched = [key for key in expected if not self._matches(actual.get(key, NAN), expected[key])]
+        else:
+            expected = expected[-1] if expected else None
+            mismatched = [] if self._matches(self.value, expected) else [type(self).__name__]
+        if mismatched:
+            raise AssertionError("%s(%s) after %d bars: streaming %r, batch %r"
+                                 % (type(self).__name__, self.ticker, len(ohlcv), self.value, expected))
+
+    def _matches(self, actual, expected):
+        if expected is None or expected != expected:
+            return actual is None or actual != actual
+        return abs(actual - expected) <= self.atol + self.rtol * abs(expected)
+
+    def _feed(self, panel, first):
+        if self.ticker not in panel.ticker_index:
+            return
+        rows = panel.array(self.ticker)
+        valid = panel.valid(self.ticker)
+        for row in range(first, len(panel)):
+            if valid[row]:
+                candle = dict(zip(panel.fields, rows[row].tolist()))
+                candle["date"] = panel.dates[row]
+                self.update(candle)
+        if self.verify and panel.start == 0:
+            self.check(panel.ohlcv([self.ticker]))
+
+    def _blank(self):
+        return NAN
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _step(self, candle):
+        raise NotImplementedError
+
+
+def _fixed_in_batch(indicator, verify, **given):
+    """
+    Refuse ``verify=True`` for parameters the batch function cannot be given.
+
+    :param given: Parameter name -> ``(value, value the batch function uses)``
+    """
+    changed = ["%s=%r" % (name, value) for name, (value, fixed) in given.items() if value != fixed]
+    if verify and changed:
+        raise ValueError("%s cannot verify %s: the batch function does not take them"
+                         % (indicator, ", ".join(changed)))
+
+
+def _typical_price(candle):
+    return (candle["high"] + candle["low"] + candle["close"]) / 3.0
+
+
+class SMA(StreamingIndicator):
+    def __init__(self, ticker, length, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._window = _Window(self.length)
+
+    def _step(self, candle):
+        return self._window.push(candle["close"]).mean
+
+
+class EMA(StreamingIndicator):
+    def __init__(self, ticker, length, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._ema = _Ema(self.length)
+
+    def _step(self, candle):
+        return self._ema.update(candle["close"])
+
+
+class WMA(StreamingIndicator):
+    verifiable = False
+
+    def __init__(self, ticker, length, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._wma = RollingWma(self.length)
+
+    def _step(self, candle):
+        return self._wma.update(candle["close"])
+
+
+class HMA(StreamingIndicator):
+    verifiable = False
+
+    def __init__(self, ticker, length, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._hma = RollingHma(self.length)
+
+    def _step(self, candle):
+        return self._hma.update(candle["close"])
+
+
+class RSI(StreamingIndicator):
+    def __init__(self, ticker, length=14, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._gain = _rma(self.length)
+        self._loss = _rma(self.length)
+        self._prev = None
+
+    def _step(self, candle):
+        close = candle["close"]
+        change = NAN if self._prev is None else close - self._prev
+        self._prev = close
+        gain = self._gain.update(max(change, 0.0) if change == change else NAN)
+        loss = self._loss.update(min(change, 0.0) if change == change else NAN)
+        return _div(100 * gain, gain + abs(loss))
+
+
+class MACD(StreamingIndicator):
+    """
+    MACD line, histogram and signal. ``MACD(ticker, data, fast, slow)`` has no
+    ``signal`` parameter, so ``verify=True`` requires the default of 9.
+    """
+
+    def __init__(self, ticker, fast=12, slow=26, signal=9, verify=False):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        suffix = "_%d_%d_%d" % (fast, slow, signal)
+        self._keys = ("MACD" + suffix, "MACDh" + suffix, "MACDs" + suffix)
+        _fixed_in_batch("MACD", verify, signal=(signal, 9))
+        super().__init__(ticker, {"fast": fast, "slow": slow}, verify)
+
+    def _blank(self):
+        return dict.fromkeys(self._keys, NAN)
+
+    def _reset(self):
+        self._fast = _Ema(self.fast)
+        self._slow = _Ema(self.slow)
+        self._signal = _Ema(self.signal)
+
+    def _step(self, candle):
+        close = candle["close"]
+        macd = self._fast.update(close) - self._slow.update(close)
+        signal = self._signal.update(macd) if macd == macd else NAN
+        return dict(zip(self._keys, (macd, macd - signal, signal)))
+
+
+class MFI(StreamingIndicator):
+    def __init__(self, ticker, length=14, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._positive = _Window(self.length)
+        self._negative = _Window(self.length)
+        self._prev = None
+
+    def _step(self, candle):
+        price = _typical_price(candle)
+        flow = price * candle["volume"]
+        up = self._prev is not None and price > self._prev
+        down = self._prev is not None and price < self._prev
+        self._prev = price
+        positive = self._positive.push(flow if up else 0.0)
+        negative = self._negative.push(flow if down else 0.0)
+        if not positive.full:
+            return NAN
+        return _div(100 * positive.total, positive.total + negative.total)
+
+
+class BB(StreamingIndicator):
+    """Bollinger bands as ``{"upper", "mid", "lower"}``; population (ddof=0) deviation."""
+
+    def __init__(self, ticker, length=20, std=2.0, verify=False):
+        self.length = length
+        self.std = std
+        super().__init__(ticker, {"length": length, "std": std}, verify)
+
+    def _blank(self):
+        return {"upper": NAN, "mid": NAN, "lower": NAN}
+
+    def _reset(self):
+        self._window = _Window(self.length)
+        self._variance = RollingVariance(self.length, ddof=0)
+
+    def _step(self, candle):
+        close = candle["close"]
+        mid = self._window.push(close).mean
+        self._variance.update(close)
+        deviation = self.std * self._variance.std
+        return {"upper": mid + deviation, "mid": mid, "lower": mid - deviation}
+
+
+class Slope(StreamingIndicator):
+    """Change in close over ``length`` bars divided by ``length``."""
+
+    def __init__(self, ticker, length=1, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._closes = deque(maxlen=self.length + 1)
+
+    def _step(self, candle):
+        self._closes.append(candle["close"])
+        if len(self._closes) <= self.length:
+            return NAN
+        return (self._closes[-1] - self._closes[0]) / self.length
+
+
+class Momentum(StreamingIndicator):
+    """Change in close over ``length`` bars."""
+
+    def __init__(self, ticker, length=10, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._closes = deque(maxlen=self.length + 1)
+
+    def _step(self, candle):
+        self._closes.append(candle["close"])
+        if len(self._closes) <= self.length:
+            return NAN
+        return self._closes[-1] - self._closes[0]
+
+
+class _TrueRange:
+    def __init__(self):
+        self.prev = None
+
+    def update(self, candle):
+        prev, self.prev = self.prev, candle
+        if prev is None:
+            return NAN
+        return max(abs(candle["high"] - candle["low"]),
+                   abs(candle["high"] - prev["close"]),
+                   abs(prev["close"] - candle["low"]))
+
+
+class ATR(StreamingIndicator):
+    def __init__(self, ticker, length=14, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._true_range = _TrueRange()
+        self._atr = _rma(self.length)
+
+    def _step(self, candle):
+        return self._atr.update(self._true_range.update(candle))
+
+
+class ADX(StreamingIndicator):
+    """Wilder's ADX line; the +DI/-DI lines are kept as ``dmp``/``dmn``."""
+
+    def __init__(self, ticker, length=14, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._true_range = _TrueRange()
+        self._atr = _rma(self.length)
+        self._plus = _rma(self.length)
+        self._minus = _rma(self.length)
+        self._adx = _rma(self.length)
+        self._prev = None
+        self.dmp = self.dmn = NAN
+
+    def _step(self, candle):
+        prev, self._prev = self._prev, candle
+        atr = self._atr.update(self._true_range.update(candle))
+        if prev is None:
+            plus = minus = NAN
+        else:
+            up = candle["high"] - prev["high"]
+            down = prev["low"] - candle["low"]
+            plus = up if up > down and up > 0 and abs(up) >= sys.float_info.epsilon else 0.0
+            minus = down if down > up and down > 0 and abs(down) >= sys.float_info.epsilon else 0.0
+        scale = _div(100.0, atr)
+        self.dmp = scale * self._plus.update(plus)
+        self.dmn = scale * self._minus.update(minus)
+        dx = _div(100.0 * abs(self.dmp - self.dmn), self.dmp + self.dmn)
+        return self._adx.update(dx)
+
+
+class CCI(StreamingIndicator):
+    """Commodity channel index; the mean deviation is O(``length``) per bar."""
+
+    def __init__(self, ticker, length=14, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._window = _Window(self.length)
+
+    def _step(self, candle):
+        price = _typical_price(candle)
+        window = self._window.push(price)
+        if not window.full:
+            return NAN
+        mean = window.mean
+        centre = math.fsum(window.values) / self.length
+        deviation = math.fsum(abs(v - centre) for v in window.values) / self.length
+        return _div(price - mean, 0.015 * deviation)
+
+
+class PPO(StreamingIndicator):
+    """Percentage price oscillator line over simple moving averages."""
+
+    def __init__(self, ticker, fast=12, slow=26, verify=False):
+        self.fast = fast
+        self.slow = slow
+        super().__init__(ticker, {"fast": fast, "slow": slow}, verify)
+
+    def _reset(self):
+        self._fast = _Window(self.fast)
+        self._slow = _Window(self.slow)
+
+    def _step(self, candle):
+        fast = self._fast.push(candle["close"]).mean
+        slow = self._slow.push(candle["close"]).mean
+        return _div(100 * (fast - slow), slow)
+
+
+class SO(StreamingIndicator):
+    """
+    Stochastic oscillator %K (smoothed); %D is kept as ``d_value``.
+
+    ``SO(ticker, data)`` takes no parameters, so ``verify=True`` requires the
+    defaults it uses.
+    """
+
+    def __init__(self, ticker, k=14, d=3, smooth_k=3, verify=False):
+        self.k = k
+        self.d = d
+        self.smooth_k = smooth_k
+        _fixed_in_batch("SO", verify, k=(k, 14), d=(d, 3), smooth_k=(smooth_k, 3))
+        super().__init__(ticker, {}, verify)
+
+    def _reset(self):
+        self._highest = RollingExtreme(self.k, largest=True)
+        self._lowest = RollingExtreme(self.k, largest=False)
+        self._smooth = _Window(self.smooth_k)
+        self._signal = _Window(self.d)
+        self.d_value = NAN
+
+    def _step(self, candle):
+        highest = self._highest.push(candle["high"])
+        lowest = self._lowest.push(candle["low"])
+        if highest != highest:
+            return NAN
+        spread = highest - lowest
+        stoch = 100 * (candle["close"] - lowest) / (spread if spread != 0 else sys.float_info.epsilon)
+        k = self._smooth.push(stoch).mean
+        if k == k:
+            self.d_value = self._signal.push(k).mean
+        return k
+
+
+class WillR(StreamingIndicator):
+    def __init__(self, ticker, length=14, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._highest = RollingExtreme(self.length, largest=True)
+        self._lowest = RollingExtreme(self.length, largest=False)
+
+    def _step(self, candle):
+        highest = self._highest.push(candle["high"])
+        lowest = self._lowest.push(candle["low"])
+        return 100 * (_div(candle["close"] - lowest, highest - lowest) - 1)
+
+
+class STDEV(StreamingIndicator):
+    """Rolling sample (ddof=1) standard deviation of the close."""
+
+    def __init__(self, ticker, length, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._variance = RollingVariance(self.length)
+
+    def _step(self, candle):
+        self._variance.update(candle["close"])
+        return self._variance.std
+
+
+class VWAP(StreamingIndicator):
+    """Volume-weighted typical price over the last ``length`` bars."""
+
+    def __init__(self, ticker, length, verify=False):
+        self.length = length
+        super().__init__(ticker, {"length": length}, verify)
+
+    def _reset(self):
+        self._traded = _Window(self.length)
+        self._volume = _Window(self.length)
+
+    def _step(self, candle):
+        traded = self._traded.push(_typical_price(candle) * candle["volume"])
+        volume = self._volume.push(candle["volume"])
+        return _div(traded.total, volume.total) if volume.full else NAN
+
+
+_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+
+
+def _period(date, anchor):
+    """
+    Calendar period of a bar date (string, date/datetime or epoch day) in
+    ``DateIndex`` terms: months since 1970-01, ``// 3`` for quarters and
+    ``// 12`` for years.
+    """
+    day = from_epoch_day(to_epoch_day(date))
+    return ((day.year - 1970) * 12 + day.month - 1) // _MONTHS[anchor]
+
+
+class AnchoredVWAP(StreamingIndicator):
+    """
+    VWAP of the typical price accumulated since the start of the bar's month,
+    quarter or year; the sums reset on the first bar dated in a new period.
+    Like the ``groupby(pd.Grouper(freq="QS"))`` cumsum version it carries
+    the last value forward while the period has no volume. The rolling
+    ``VWAP(ticker, data, length)`` counterpart is ``VWAP``.
+
+    Fed by an ingestor, periods come from a DateIndex following the panel,
+    which parses each date once; ``update`` and ``warm_up`` parse the
+    candle's date. There is no batch function, so ``verify`` is refused.
+    """
+
+    verifiable = False
+
+    def __init__(self, ticker, anchor_period="quarter", verify=False):
+        if anchor_period not in ("month", "quarter", "year"):
+            raise ValueError("anchor_period must be one of 'month', 'quarter', or 'year'")
+        self.anchor_period = anchor_period
+        self._dates = DateIndex()
+        super().__init__(ticker, {"anchor_period": anchor_period}, verify)
+
+    def _reset(self):
+        self.period = None
+        self._traded = 0.0
+        self._volume = 0.0
+
+    def on_rebuild(self, panel):
+        self._dates.on_rebuild(panel)
+        super().on_rebuild(panel)
+
+    def on_append(self, panel, count):
+        self._dates.on_append(panel, count)
+        super().on_append(panel, count)
+
+    def _feed(self, panel, first):
+        if self.ticker not in panel.ticker_index:
+            return
+        periods = self._dates.month // _MONTHS[self.anchor_period]
+        rows = panel.array(self.ticker)
+        valid = panel.valid(self.ticker)
+        for row in range(first, len(panel)):
+            if valid[row]:
+                self.value = self._accumulate(int(periods[row]), dict(zip(panel.fields, rows[row].tolist())))
+                self.count += 1
+
+    def _step(self, candle):
+        return self._accumulate(_period(candle["date"], self.anchor_period), candle)
+
+    def _accumulate(self, period, candle):
+        if period != self.period:
+            self.period = period
+            self._traded = self._volume = 0.0
+        self._traded += _typical_price(candle) * candle["volume"]
+        self._volume += candle["volume"]
+        return self._traded / self._volume if self._volume else self.value
+
+
+class OBV(StreamingIndicator):
+    """On-balance volume; ``length`` is accepted for parity with the batch signature."""
+
+    def __init__(self, ticker, length=None, verify=False):
+        self.length = length
+        super().__init__(ticker, {} if length is None else {"length": length}, verify)
+
+    def _reset(self):
+        self._prev = None
+        self._total = 0.0
+
+    def _step(self, candle):
+        close, volume = candle["close"], candle["volume"]
+        sign = 1 if self._prev is None or close > self._prev else -1 if close < self._prev else 0
+        self._prev = close
+        self._total += sign * volume
+        return self._total
+
+
+class PSAR(StreamingIndicator):
+    """
+    Parabolic SAR (long and short stops in one line), NaN on the first bar.
+
+    The stop is capped by the previous two bars' extremes; on the second bar
+    only the first one exists. ``PSAR(ticker, data)`` takes no parameters, so
+    ``verify=True`` requires the default acceleration factors.
+    """
+
+    def __init__(self, ticker, af0=0.02, af=0.02, max_af=0.2, verify=False):
+        self.af0 = af0
+        self.af_start = af
+        self.max_af = max_af
+        _fixed_in_batch("PSAR", verify, af0=(af0, 0.02), af=(af, 0.02), max_af=(max_af, 0.2))
+        super().__init__(ticker, {}, verify)
+
+    def _reset(self):
+        self.falling = None
+        self.af = self.af_start
+        self._sar = self._ep = NAN
+        self._bars = deque(maxlen=2)
+
+    def _step(self, candle):
+        high, low = candle["high"], candle["low"]
+        if not self._bars:
+            self._bars.append((high, low))
+            return NAN
+        if self.falling is None:
+            first_high, first_low = self._bars[0]
+            up, down = high - first_high, first_low - low
+            self.falling = down > up and down > 0
+            self._sar, self._ep = (first_high, first_low) if self.falling else (first_low, first_high)
+        sar = self._sar + self.af * (self._ep - self._sar)
+        if self.falling:
+            reverse = high > sar
+            if low < self._ep:
+                self._ep = low
+                self.af = min(self.af + self.af0, self.max_af)
+            sar = max(sar, *(bar[0] for bar in self._bars))
+        else:
+            reverse = low < sar
+            if high > self._ep:
+                self._ep = high
+                self.af = min(self.af + self.af0, self.max_af)
+            sar = min(sar, *(bar[1] for bar in self._bars))
+        if reverse:
+            sar = self._ep
+            self.af = self.af0
+            self.falling = not self.falling
+            self._ep = low if self.falling else high
+        self._sar = sar
+        self._bars.append((high, low))
+        return sar
@@ -0,0 +1,149 @@
+import numpy as np
+
+from .dates import DateIndex, next_weekday, to_epoch_day
+
+
+class Schedule:
+    """
+    A rebalance rule evaluated over a TradingCalendar.
+
+    ``rule(calendar, lo, hi)`` returns a boolean array marking the bars in
+    ``[lo, hi)`` on which the schedule fires. Build one with the module
+    helpers (``weekly``, ``month_end``, ``every`` ...) rather than directly.
+    """
+
+    def __init__(self, name, rule):
+        self.name = name
+        self.rule = rule
+
+    def __repr__(self):
+        return "Schedule(%s)" % self.name
+
+
+def weekly(weekday):
+    """Fires on the given weekday (Monday=0)."""
+    return Schedule("weekly(%d)" % weekday, lambda cal, lo, hi: cal._weekday[lo:hi] == weekday)
+
+
+def week_end():
+    """Fires on the last session of each week."""
+    return Schedule("week_end", lambda cal, lo, hi: cal._week_end[lo:hi].copy())
+
+
+def month_end():
+    """Fires on the last session of each month."""
+    return Schedule("month_end", lambda cal, lo, hi: cal._month_end[lo:hi].copy())
+
+
+def quarter_end():
+    """Fires on the last session of each quarter."""
+    return Schedule("quarter_end", lambda cal, lo, hi: cal._quarter_end[lo:hi].copy())
+
+
+def month_day(day):
+    """Fires on the first session on or after the given day of the month."""
+    return Schedule("month_day(%d)" % day, lambda cal, lo, hi: cal._first_on_or_after_day(day, lo, hi))
+
+
+def nth_session(n):
+    """Fires on the ``n``-th session of each month (1-based)."""
+    return Schedule("nth_session(%d)" % n, lambda cal, lo, hi: cal._session_of_month[lo:hi] == n)
+
+
+def every(bars):
+    """Fires on every ``bars``-th bar of the history, counting the first bar as 1."""
+    return Schedule("every(%d)" % bars,
+                    lambda cal, lo, hi: (np.arange(cal.start + lo, cal.start + hi) + 1) % bars == 0)
+
+
+class TradingCalendar(DateIndex):
+    """
+    Session table built from the bar dates, for rebalance scheduling.
+
+    Extends DateIndex with ``week_end`` and ``session_of_month`` columns so
+    that "last trading day of the week/month/quarter" and "N-th trading day
+    of the month" are O(1) array lookups, without building pandas objects.
+    Sessions are the distinct bar days; the session after the newest bar is
+    projected as the next weekday not listed in ``holidays``.
+
+    Schedules passed to ``rebalance_indices`` are registered and their firing
+    bars kept up to date as bars are appended, so a runner can check
+    ``is_rebalance(schedule)`` and skip the heavy part of ``run()`` on other
+    bars. Indices are global bar numbers, i.e. positions in ``data["ohlcv"]``.
+    """
+
+    _COLUMNS = DateIndex._COLUMNS + ("week_end", "session_of_month")
+
+    def __init__(self, dates=(), holidays=()):
+        self.holidays = {to_epoch_day(d) for d in holidays}
+        self._week_end = np.empty(0, dtype=bool)
+        self._session_of_month = np.empty(0, dtype=np.int16)
+        self._schedules = {}
+        super().__init__(dates)
+
+    @property
+    def week_end(self):
+        return self._week_end[:self._length]
+
+    @property
+    def session_of_month(self):
+        return self._session_of_month[:self._length]
+
+    def is_week_end(self, i=-1):
+        return bool(self._week_end[i % self._length])
+
+    def is_month_end(self, i=-1):
+        return bool(self._month_end[i % self._length])
+
+    def is_quarter_end(self, i=-1):
+        return bool(self._quarter_end[i % self._length])
+
+    def is_nth_session(self, n, i=-1):
+        return int(self._session_of_month[i % self._length]) == n
+
+    def rebalance_indices(self, schedule):
+        """Global bar numbers on which ``schedule`` fired, registering it on first use."""
+        if schedule.name not in self._schedules:
+            fired = np.flatnonzero(schedule.rule(self, 0, self._length)) + self.start
+            self._schedules[schedule.name] = (schedule, fired.tolist())
+        return np.array(self._schedules[schedule.name][1], dtype=np.int64)
+
+    def is_rebalance(self, schedule, i=-1):
+        """Whether ``schedule`` fires on bar ``i``; O(1) and does not register the schedule."""
+        i = i % self._length
+        return bool(schedule.rule(self, i, i + 1)[0])
+
+    def _next_session(self, day):
+        day = next_weekday(day)
+        while day in self.holidays:
+            day = next_weekday(day)
+        return day
+
+    def _refresh_flags(self, first):
+        next_days = super()._refresh_flags(first)
+        n = self._length
+        days = self._days[:n]
+        self._week_end[first:n] = (next_days + 3) // 7 != (days[first:] + 3) // 7
+
+        # Count sessions within each month, seeded from the bar before ``first``.
+        prev_days = np.empty(n - first, dtype=np.int64)
+        prev_days[1:] = days[first:n - 1]
+        prev_days[0] = days[first - 1] if first else -1
+        new_day = days[first:] != prev_days
+        new_month = np.empty(n - first, dtype=bool)
+        new_month[1:] = self._month[first + 1:n] != self._month[first:n - 1]
+        new_month[0] = not first or self._month[first] != self._month[first - 1]
+        counted = np.cumsum(new_day)
+        base = np.where(new_month, counted - 1, 0)
+        np.maximum.accumulate(base, out=base)
+        seed = 0 if new_month[0] else int(self._session_of_month[first - 1])
+        ordinal = counted - base
+        ordinal[base == 0] += seed
+        self._session_of_month[first:n] = ordinal
+
+        for name, (schedule, fired) in self._schedules.items():
+            boundary = self.start + first
+            while fired and fired[-1] >= boundary:
+                fired.pop()
+            fired.extend((np.flatnonzero(schedule.rule(self, first, n)) + boundary).tolist())
+        return next_days
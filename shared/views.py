@@ -0,0 +1,77 @@
+from collections.abc import Mapping, Sequence
+
+
+class OhlcvView(Sequence):
+    """
+    Read-only list-of-dicts view of a bar range of a HistoryStore or OhlcvPanel.
+
+    Indexing returns a BarView; slicing returns another OhlcvView without
+    touching the data. Candle reads are reported to ``stats`` (an
+    AccessStats) when one is given.
+    """
+
+    def __init__(self, source, tickers, start, stop, stats=None):
+        self.source = source
+        self.tickers = list(tickers)
+        self.start = start
+        self.stop = stop
+        self.stats = stats
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return [self[j] for j in range(start, stop, step)]
+            return OhlcvView(self.source, self.tickers, self.start + start, self.start + max(stop, start),
+                             stats=self.stats)
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("bar index out of range")
+        return BarView(self.source, self.tickers, self.start + i, stats=self.stats)
+
+
+class BarView(Mapping):
+    """
+    One bar of a HistoryStore or OhlcvPanel as a mapping of ticker -> OHLCV dict.
+
+    Candle dicts are built on access, so callers can't modify the source.
+    """
+
+    def __init__(self, source, tickers, row, stats=None):
+        self.source = source
+        self.tickers = tickers
+        self.row = row
+        self.stats = stats
+        self._present = None
+
+    def _keys(self):
+        if self._present is None:
+            self._present = [
+                ticker for ticker in self.tickers
+                if ticker in self.source.ticker_index and self.source.is_valid(ticker, self.row)
+            ]
+        return self._present
+
+    def __contains__(self, ticker):
+        return ticker in self._keys()
+
+    def __getitem__(self, ticker):
+        if ticker not in self._keys():
+            raise KeyError(ticker)
+        if self.stats is not None:
+            self.stats.record(ticker)
+        values = self.source.array(ticker)[self.row]
+        candle = {field: float(values[f]) for field, f in self.source.field_index.items()}
+        candle["date"] = self.source.date_at(self.row)
+        return candle
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
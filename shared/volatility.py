@@ -0,0 +1,222 @@
+import math
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .kernels import RollingVariance, rolling_sum
+
+
+def log_returns(closes, fill=0.0):
+    """
+    ``log(close / previous close)`` over bars; the first bar, which has no
+    previous close, is ``fill`` (0 as after the strategies' ``fillna(0)``).
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    out = np.empty(closes.shape)
+    if len(closes):
+        out[0] = fill
+        out[1:] = np.log(closes[1:] / closes[:-1])
+    return out
+
+
+def realized_volatility(returns, window, shift=0, exact=False):
+    """
+    Rolling realized volatility ``sqrt(sum(r ** 2) / (window - 1))``.
+
+    Window sums of squares come from one cumulative sum by default, replacing
+    ``returns.rolling(window).apply(realized_volatility_daily)`` and its
+    Python call per window.
+
+    :param returns: Log returns over bars, or a (bar, ticker) array
+    :param shift: Delay the returns by ``shift`` bars first, filling with
+        0, like ``returns.shift(shift).fillna(0)``
+    :param exact: Sum each window separately (O(N * window)) so results are
+        bit-for-bit those of the ``rolling.apply`` version for a single
+        series; the cumulative sum agrees to about 1e-13 relative
+    :return: Array over bars, NaN until ``window`` returns are available
+        and for windows containing NaN
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if shift:
+        delayed = np.zeros(returns.shape)
+        delayed[shift:] = returns[:-shift]
+        returns = delayed
+    if not exact:
+        squares = rolling_sum(returns * returns, window)
+    else:
+        squares = np.full(returns.shape, np.nan)
+        if len(returns) >= window:
+            squares[window - 1:] = (sliding_window_view(returns, window, axis=0) ** 2).sum(axis=-1)
+    return np.sqrt(np.maximum(squares, 0.0) / (window - 1))
+
+
+class RollingVolatility:
+    """
+    Incremental ``realized_volatility`` fed one close at a time.
+
+    Keeps the last ``window`` squared log returns and their running sum
+    (re-summed exactly every ``window`` bars), so ``update`` is O(1). The
+    first return is 0 and ``shift`` delays the returns as in
+    ``realized_volatility``; ``value`` is NaN until the window is full.
+    """
+
+    def __init__(self, window, shift=0):
+        self.window = window
+        self.shift = shift
+        self.value = math.nan
+        self._prev = None
+        self._delay = deque([0.0] * shift)
+        self._squares = deque()
+        self._total = 0.0
+        self._pushes = 0
+
+    def update(self, close):
+        r = 0.0 if self._prev is None else math.log(close / self._prev)
+        self._prev = close
+        if self.shift:
+            self._delay.append(r)
+            r = self._delay.popleft()
+        if len(self._squares) == self.window:
+            self._total -= self._squares.popleft()
+        self._squares.append(r * r)
+        self._total += r * r
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            self._total = math.fsum(self._squares)
+        if len(self._squares) == self.window:
+            self.value = math.sqrt(max(self._total, 0.0) / (self.window - 1))
+        return self.value
+
+
+def inverse_volatility_weights(volatilities, floor=None, default=None):
+    """
+    Weights proportional to ``1 / volatility``, summing to 1.
+
+    :param volatilities: Dict of ticker -> volatility
+    :param floor: Lower bound applied to every volatility first, like
+        ``1 / max(v, 0.01)``
+    :param default: Volatility used for missing, NaN or non-positive
+        values; those tickers are dropped when it is None
+    :return: Dict of ticker -> weight; equal weights if no inverse is positive
+    """
+    inverse = {}
+    for ticker, vol in volatilities.items():
+        if vol is None or not vol > 0 or math.isinf(vol):
+            vol = default
+        if vol is None:
+            continue
+        if floor is not None:
+            vol = max(vol, floor)
+        inverse[ticker] = 1.0 / vol
+    total = sum(inverse.values())
+    if not total > 0:
+        return {ticker: 1.0 / len(volatilities) for ticker in volatilities} if volatilities else {}
+    return {ticker: value / total for ticker, value in inverse.items()}
+
+
+class _Deviations:
+    """Previous close and one RollingVariance per watched key for a ticker."""
+
+    def __init__(self, keys):
+        self.previous = math.nan
+        self.windows = {key: RollingVariance(key[1], ddof=key[2]) for key in keys}
+
+
+class VolatilityBank:
+    """
+    Running standard deviations per ticker and window, fed by an OhlcvIngestor.
+
+    Windows are registered with ``watch(length, field="returns", ddof=1)``.
+    ``field`` is ``"returns"`` (simple close-to-close returns),
+    ``"log_returns"`` or any panel field such as ``"close"`` (what
+    ``STDEV(ticker, ohlcv, length)`` measures). ``length=None`` is an
+    expanding window over the ticker's whole history, e.g. ``STDEV(ticker,
+    ohlcv, len(ohlcv))``. Each (ticker, window) keeps a RollingVariance, so a
+    new bar costs O(1) per window and values match ``rolling(length).std()``
+    / ``expanding().std()`` exactly. Returns are taken between a ticker's
+    consecutive valid bars; the first one is NaN as with ``pct_change``, and
+    so is a return from a zero (or negative) close.
+
+    ``annualized`` scales by ``sqrt(periods_per_year)`` and ``volatilities``
+    gathers a dict ready for ``inverse_volatility_weights``. A window
+    watched after subscribing is first fed the bars the panel holds.
+    """
+
+    def __init__(self, tickers=None, windows=(), periods_per_year=252):
+        """
+        :param windows: Lengths, or ``(length, field)`` / ``(length, field, ddof)`` tuples
+        """
+        self.tickers = list(tickers) if tickers is not None else None
+        self.periods_per_year = periods_per_year
+        self.windows = []
+        self._deviations = {}
+        self._panel = None
+        for window in windows:
+            if isinstance(window, tuple):
+                self.watch(*window)
+            else:
+                self.watch(window)
+
+    def watch(self, length, field="returns", ddof=1):
+        key = (field, length, ddof)
+        if key not in self.windows:
+            self.windows.append(key)
+            for deviations in self._deviations.values():
+                deviations.windows[key] = RollingVariance(length, ddof=ddof)
+            if self._panel is not None:
+                self._feed(self._panel, 0, [key])
+        return self
+
+    def on_rebuild(self, panel):
+        tickers = self.tickers if self.tickers is not None else panel.tickers
+        self._deviations = {ticker: _Deviations(self.windows) for ticker in tickers}
+        self._panel = panel
+        self._feed(panel, 0)
+
+    def on_append(self, panel, count):
+        for ticker in panel.tickers:
+            if self.tickers is None and ticker not in self._deviations:
+                self._deviations[ticker] = _Deviations(self.windows)
+        self._panel = panel
+        self._feed(panel, max(len(panel) - count, 0))
+
+    def std(self, ticker, length, field="returns", ddof=1):
+        return float(self._deviations[ticker].windows[(field, length, ddof)].std)
+
+    def variance(self, ticker, length, field="returns", ddof=1):
+        return float(self._deviations[ticker].windows[(field, length, ddof)].value)
+
+    def mean(self, ticker, length, field="returns", ddof=1):
+        return float(self._deviations[ticker].windows[(field, length, ddof)].mean)
+
+    def annualized(self, ticker, length, field="returns", ddof=1):
+        return self.std(ticker, length, field, ddof) * math.sqrt(self.periods_per_year)
+
+    def volatilities(self, tickers, length, field="returns", ddof=1, annualize=True):
+        """Dict of ticker -> (annualized) standard deviation; NaN for unknown tickers."""
+        read = self.annualized if annualize else self.std
+        return {ticker: read(ticker, length, field, ddof) if ticker in self._deviations else math.nan
+                for ticker in tickers}
+
+    def _feed(self, panel, first, keys=None):
+        """Feed rows from ``first`` into every window, or replay them into ``keys`` alone."""
+        fields = {field for field, _, _ in self.windows if field not in ("returns", "log_returns")}
+        fields = [field for field in fields | {"close"} if field in panel.field_index]
+        for ticker, deviations in self._deviations.items():
+            if ticker not in panel.ticker_index:
+                continue
+            array = panel.array(ticker)
+            valid = panel.valid(ticker)
+            windows = deviations.windows if keys is None else {key: deviations.windows[key] for key in keys}
+            previous = deviations.previous if keys is None else math.nan
+            for row in np.flatnonzero(valid[first:]) + first:
+                values = {field: float(array[row, panel.field_index[field]]) for field in fields}
+                close = values["close"]
+                values["returns"] = close / previous - 1 if previous > 0 else math.nan
+                values["log_returns"] = float(np.log(close / previous)) if previous > 0 and close > 0 else math.nan
+                previous = close
+                for (field, _, _), window in windows.items():
+                    window.update(values[field])
+            if keys is None:
+                deviations.previous = previous
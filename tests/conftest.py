@@ -0,0 +1,32 @@
+import sys
+import types
+
+import pytest
+
+
+class _TargetAllocation(dict):
+    pass
+
+
+@pytest.fixture
+def surmount(monkeypatch):
+    """
+    Minimal ``surmount`` package in ``sys.modules``: ``Strategy``,
+    ``TargetAllocation`` and ``log``, plus an empty ``technical_indicators``
+    module that tests fill with batch functions.
+    """
+    package = types.ModuleType("surmount")
+    package.__path__ = []
+    base_class = types.ModuleType("surmount.base_class")
+    base_class.Strategy = type("Strategy", (), {})
+    base_class.TargetAllocation = _TargetAllocation
+    logging = types.ModuleType("surmount.logging")
+    logging.log = lambda *args, **kwargs: None
+    technical_indicators = types.ModuleType("surmount.technical_indicators")
+    for name, module in (("base_class", base_class), ("logging", logging),
+                         ("technical_indicators", technical_indicators)):
+        setattr(package, name, module)
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setitem(sys.modules, "surmount", package)
+    return package
+
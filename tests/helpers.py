@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def weekdays(bars, start="2000-01-03"):
+    """``bars`` consecutive Monday-Friday dates from ``start`` as numpy datetime64[D]."""
+    return np.busday_offset(np.datetime64(start), np.arange(bars), roll="forward")
+
+
+def daily_ohlcv(tickers, bars, seed=0, start="2000-01-03"):
+    """Seeded random-walk ``data["ohlcv"]`` over weekdays, one candle per ticker per bar."""
+    rng = np.random.default_rng(seed)
+    days = weekdays(bars, start)
+    series = {}
+    for i, ticker in enumerate(tickers):
+        drift, scale = (0.0003, 0.012) if i == 0 else (0.00005, 0.0005)
+        closes = 100 * np.exp(np.cumsum(rng.normal(drift, scale, bars)))
+        spread = closes * rng.uniform(0.0, 0.01, bars)
+        series[ticker] = (closes, spread, rng.integers(1_000, 1_000_000, bars))
+    ohlcv = []
+    for row, day in enumerate(days):
+        bar = {}
+        for ticker, (closes, spread, volume) in series.items():
+            close = float(closes[row])
+            bar[ticker] = {"open": close, "high": close + float(spread[row]), "low": close - float(spread[row]),
+                           "close": close, "volume": float(volume[row]), "date": "%s 00:00:00" % day}
+        ohlcv.append(bar)
+    return ohlcv
+
+
+def flat_ohlcv(closes, ticker="X", start="2020-01-01"):
+    """``data["ohlcv"]`` of one ticker whose open, high, low and close all equal ``closes``."""
+    return [{ticker: {"open": c, "high": c, "low": c, "close": c, "volume": 1.0, "date": "%s 00:00:00" % day}}
+            for c, day in zip(closes, weekdays(len(closes), start))]
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from shared import MovingAverageBank, OhlcvIngestor
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "BIL", "QQQ"]
+WINDOWS = [5, 63, 84, 105, 126, 147, 168, 189]
+
+
+def _ohlcv():
+    """QQQ is listed after 30 bars and misses bar 200."""
+    ohlcv = daily_ohlcv(TICKERS, 400, seed=9)
+    for row in list(range(30)) + [200]:
+        del ohlcv[row]["QQQ"]
+    return ohlcv
+
+
+def _closes(ohlcv):
+    return pd.DataFrame([{t: bar[t]["close"] for t in bar} for bar in ohlcv], columns=TICKERS)
+
+
+def test_means_match_rolling_mean():
+    ohlcv = _ohlcv()
+    closes = _closes(ohlcv)
+    expected = {k: closes.rolling(k).mean().to_numpy() for k in WINDOWS}
+    ingestor = OhlcvIngestor(TICKERS)
+    bank = ingestor.subscribe(MovingAverageBank(TICKERS + ["GLD"]))
+    for n in range(1, len(ohlcv) + 1):
+        ingestor.update(ohlcv[:n])
+        means = bank.means(WINDOWS)
+        assert np.isnan(means[3]).all()
+        for j, k in enumerate(WINDOWS):
+            np.testing.assert_allclose(means[:3, j], expected[k][n - 1], rtol=1e-13)
+
+    history = bank.history(WINDOWS)
+    for j, k in enumerate(WINDOWS):
+        np.testing.assert_allclose(history[:, :3, j], expected[k], rtol=1e-13)
+    last = closes.iloc[-1].to_numpy()
+    votes = np.mean([last > expected[k][-1] for k in WINDOWS], axis=0)
+    np.testing.assert_array_equal(bank.vote(WINDOWS)[:3], votes)
+    assert bank.as_dict(bank.vote(WINDOWS))["GLD"] == 0.0
+
+
+def test_bounded_bank_follows_bounded_panel():
+    ohlcv = _ohlcv()
+    closes = _closes(ohlcv)
+    ingestor = OhlcvIngestor(TICKERS, max_bars=200)
+    bank = ingestor.subscribe(MovingAverageBank(max_window=189))
+    for n in range(1, len(ohlcv) + 1):
+        ingestor.update(ohlcv[:n])
+        for k in (63, 189):
+            np.testing.assert_allclose(bank.means(k)[:, 0], closes.rolling(k).mean().to_numpy()[n - 1], rtol=1e-13)
+    assert bank.start > 0
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from shared import OhlcvIngestor, OhlcvPanel
+from shared.cross_section import EMA_many, Momentum_many, RSI_many, SMA_many, STDEV_many, _ewm
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "BIL", "QQQ"]
+
+
+def _ohlcv():
+    """QQQ is listed 30 bars after the others."""
+    ohlcv = daily_ohlcv(TICKERS, 400, seed=4)
+    for bar in ohlcv[:30]:
+        del bar["QQQ"]
+    return ohlcv
+
+
+def _ema(closes, length):
+    seeded = closes.copy()
+    seeded.iloc[:length - 1] = np.nan
+    seeded.iloc[length - 1] = closes.iloc[:length].mean()
+    return seeded.ewm(span=length, adjust=False).mean()
+
+
+def _rsi(closes, length):
+    change = closes.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / length, min_periods=length).mean()
+    loss = change.clip(upper=0).ewm(alpha=1 / length, min_periods=length).mean()
+    return 100 * gain / (gain + loss.abs())
+
+
+REFERENCES = {
+    SMA_many: lambda closes: closes.rolling(20).mean(),
+    STDEV_many: lambda closes: closes.rolling(20).std(),
+    Momentum_many: lambda closes: closes.diff(20),
+    EMA_many: lambda closes: _ema(closes, 20),
+    RSI_many: lambda closes: _rsi(closes, 20),
+}
+
+
+def test_many_match_per_ticker_pandas():
+    ohlcv = _ohlcv()
+    ingestor = OhlcvIngestor(TICKERS)
+    ingestor.update(ohlcv)
+    for function, reference in REFERENCES.items():
+        results = function(TICKERS, ingestor, 20)
+        for ticker in TICKERS:
+            closes = pd.Series([bar[ticker]["close"] for bar in ohlcv if ticker in bar])
+            expected = np.full(len(ohlcv), np.nan)
+            expected[len(ohlcv) - len(closes):] = reference(closes).to_numpy()
+            np.testing.assert_allclose(results[ticker], expected, rtol=1e-9, atol=1e-9,
+                                       err_msg="%s %s" % (function.__name__, ticker))
+        for source in (ohlcv, ingestor.panel):
+            other = function(TICKERS, source, 20)
+            for ticker in TICKERS:
+                np.testing.assert_array_equal(other[ticker], results[ticker])
+
+
+def test_ewm_matches_pandas_across_gaps():
+    rng = np.random.default_rng(6)
+    values = 100 + np.cumsum(rng.normal(0, 1, (3000, 4)), axis=0)
+    values[rng.random(values.shape) < 0.2] = np.nan
+    values[:500, 1] = np.nan
+    values[1000:1400, 2] = np.nan
+    for alpha in (1.0, 0.5, 1 / 14, 2 / 201):
+        for min_periods in (0, 14):
+            expected = pd.DataFrame(values).ewm(alpha=alpha, adjust=True, min_periods=min_periods).mean()
+            np.testing.assert_allclose(_ewm(values, alpha, True, min_periods), expected.to_numpy(), rtol=1e-12)
+        # Without gaps adjust=False is the plain recurrence.
+        dense = np.where(np.isnan(values), 100.0, values)
+        dense[:500, 1] = np.nan
+        expected = pd.DataFrame(dense).ewm(alpha=alpha, adjust=False).mean()
+        np.testing.assert_allclose(_ewm(dense, alpha, False), expected.to_numpy(), rtol=1e-12)
+
+
+def test_panel_and_compact_panel_agree():
+    ohlcv = _ohlcv()
+    wide = SMA_many(TICKERS, OhlcvPanel.from_ohlcv(ohlcv), 50)
+    narrow = SMA_many(TICKERS, OhlcvPanel.from_ohlcv(ohlcv, compact=True), 50)
+    for ticker in TICKERS:
+        np.testing.assert_allclose(narrow[ticker], wide[ticker], rtol=1e-6)
@@ -0,0 +1,57 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from shared import DateIndex, OhlcvIngestor, from_epoch_day, to_epoch_day
+from tests.helpers import daily_ohlcv, weekdays
+
+
+def test_epoch_days_round_trip():
+    for date in ("1970-01-01 00:00:00", "1999-12-31 23:59:59", "2024-02-29 09:30:00"):
+        day = to_epoch_day(date)
+        assert day == (np.datetime64(date[:10]) - np.datetime64("1970-01-01")).astype(int)
+        assert from_epoch_day(day) == datetime.date.fromisoformat(date[:10])
+        assert to_epoch_day(from_epoch_day(day)) == to_epoch_day(datetime.datetime.fromisoformat(date)) == day
+    assert to_epoch_day(np.int64(12)) == 12
+
+
+def test_columns_and_lookups_match_pandas():
+    dates = ["%s 00:00:00" % day for day in weekdays(400, "2019-11-20")]
+    index = DateIndex(dates[:1])
+    index.extend(dates[1:250])
+    index.extend(dates[250:])
+    stamps = pd.to_datetime(pd.Series(dates))
+    assert index.days.tolist() == [to_epoch_day(date) for date in dates]
+    assert index.weekday.tolist() == stamps.dt.weekday.tolist()
+    assert index.day_of_month.tolist() == stamps.dt.day.tolist()
+    months = ((stamps.dt.year - 1970) * 12 + stamps.dt.month - 1).to_numpy()
+    assert index.month.tolist() == months.tolist()
+    assert index.quarter.tolist() == (months // 3).tolist()
+    # The newest day is followed by the next weekday.
+    following = stamps.shift(-1).fillna(stamps.iloc[-1] + pd.offsets.BDay())
+    assert index.month_end.tolist() == (stamps.dt.month != following.dt.month).tolist()
+    assert index.quarter_end.tolist() == (stamps.dt.quarter != following.dt.quarter).tolist()
+
+    assert index.index_at_or_before("2020-01-01") == index.index_on_or_after("2020-01-01")
+    assert index.index_at_or_before("2020-01-04") == index.index_on_or_after("2020-01-04") - 1
+    assert index.date(index.index_on_or_after("2020-01-04")) == datetime.date(2020, 1, 6)
+    assert index.index_at_or_before("2019-01-01") == -1
+    assert index.index_on_or_after("2040-01-01") == len(index)
+    assert index.date() == datetime.date(2021, 6, 1)
+    assert index.date(index.index_days_ago(365)) == datetime.date(2020, 6, 1)
+    assert index.date(index.index_days_ago(367)) == datetime.date(2020, 5, 29)
+    assert index.is_first_on_or_after_day(1, dates.index("2020-02-03 00:00:00"))
+    assert not index.is_first_on_or_after_day(1, dates.index("2020-02-04 00:00:00"))
+
+
+def test_follows_a_bounded_panel():
+    ohlcv = daily_ohlcv(["SPY"], 200)
+    ingestor = OhlcvIngestor(["SPY"], max_bars=30)
+    index = ingestor.subscribe(DateIndex())
+    for n in range(1, len(ohlcv) + 1):
+        panel = ingestor.update(ohlcv[:n])
+        assert index.start == panel.start
+        assert index.days.tolist() == [to_epoch_day(date) for date in panel.dates]
+    reference = DateIndex([bar["SPY"]["date"] for bar in ohlcv])
+    assert index.month_end.tolist() == reference.month_end[index.start:].tolist()
@@ -0,0 +1,34 @@
+import math
+
+from shared import ExtremesTracker, OhlcvIngestor
+from tests.helpers import flat_ohlcv
+
+
+def test_drawdown_waits_for_positive_peak():
+    tracker = ExtremesTracker(["X"], windows=(2,))
+    ingestor = OhlcvIngestor(["X"])
+    ingestor.subscribe(tracker)
+    ingestor.update(flat_ohlcv([0.0]))
+    assert math.isnan(tracker.drawdown("X"))
+    assert tracker.max_drawdown("X") == 0.0
+    ingestor.update(flat_ohlcv([0.0, 1.0, 2.0, 1.5]))
+    assert tracker.peak("X") == 2.0
+    assert tracker.drawdown("X") == -0.25
+    assert tracker.max_drawdown("X") == -0.25
+    assert tracker.high("X", 2) == 2.0
+
+
+def test_window_watched_after_subscribing_sees_earlier_bars():
+    closes = [float(c) for c in range(30, 0, -1)]
+    late = ExtremesTracker(["X"])
+    early = ExtremesTracker(["X"], windows=(20,))
+    ingestor = OhlcvIngestor(["X"])
+    ingestor.subscribe(late)
+    ingestor.subscribe(early)
+    ingestor.update(flat_ohlcv(closes[:25]))
+    late.watch(20)
+    ingestor.update(flat_ohlcv(closes))
+    assert late.high("X", 20) == early.high("X", 20) == 20.0
+    assert late.low("X", 20) == 1.0
+    assert late.peak("X") == 30.0
+    assert late.max_drawdown("X") == early.max_drawdown("X")
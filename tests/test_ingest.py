@@ -0,0 +1,84 @@
+import copy
+
+import numpy as np
+
+from shared import OhlcvIngestor, OhlcvPanel
+from tests.helpers import daily_ohlcv
+
+
+def _assert_same_panel(panel, expected):
+    assert panel.tickers == expected.tickers
+    assert panel.start == expected.start
+    assert list(panel.dates) == list(expected.dates)
+    np.testing.assert_array_equal(panel.values, expected.values)
+    np.testing.assert_array_equal(panel.valid(), expected.valid())
+    np.testing.assert_array_equal(panel.last_valid(), expected.last_valid())
+    np.testing.assert_array_equal(panel.first_valid, expected.first_valid)
+
+
+def test_growing_replay_appends_each_bar_once():
+    ohlcv = daily_ohlcv(["SPY", "BIL"], 80)
+    for bar in ohlcv[:10]:
+        del bar["BIL"]
+    ingestor = OhlcvIngestor()
+    for n in range(1, len(ohlcv) + 1):
+        _assert_same_panel(ingestor.update(ohlcv[:n]), OhlcvPanel.from_ohlcv(ohlcv[:n]))
+    # One rebuild for the first bar, one when BIL first appears.
+    assert ingestor.rebuilds == 2
+    assert ingestor.appended == len(ohlcv) - 2
+
+
+def test_sliding_window_appends_the_new_bar():
+    ohlcv = daily_ohlcv(["SPY", "BIL"], 80)
+    ingestor = OhlcvIngestor(["SPY", "BIL"])
+    for n in range(1, len(ohlcv) + 1):
+        panel = ingestor.update(ohlcv[max(n - 20, 0):n])
+        _assert_same_panel(panel, OhlcvPanel.from_ohlcv(ohlcv[:n]))
+    assert ingestor.rebuilds == 1
+    assert ingestor.appended == len(ohlcv) - 1
+
+
+def test_rewritten_history_is_rebuilt():
+    ohlcv = daily_ohlcv(["SPY", "BIL"], 40)
+    ingestor = OhlcvIngestor(["SPY", "BIL"])
+    ingestor.update(ohlcv)
+
+    adjusted = copy.deepcopy(ohlcv)
+    for bar in adjusted:
+        bar["SPY"]["close"] /= 2
+    _assert_same_panel(ingestor.update(adjusted), OhlcvPanel.from_ohlcv(adjusted))
+    assert ingestor.rebuilds == 2
+
+    _assert_same_panel(ingestor.update(adjusted[:30]), OhlcvPanel.from_ohlcv(adjusted[:30]))
+    assert ingestor.rebuilds == 3
+
+    # Only the first and last bars are compared: a rewrite strictly between
+    # them goes unnoticed until ``reset``.
+    middle = copy.deepcopy(adjusted[:30])
+    middle[15]["SPY"]["close"] = 1.0
+    assert ingestor.update(middle).close("SPY")[15] != 1.0
+    ingestor.reset()
+    assert ingestor.update(middle).close("SPY")[15] == 1.0
+    assert ingestor.rebuilds == 4
+
+
+def test_bounded_replay_matches_from_ohlcv():
+    ohlcv = daily_ohlcv(["SPY", "BIL"], 80)
+    for bar in ohlcv[20:35]:
+        del bar["BIL"]
+    for compact in (False, True):
+        ingestor = OhlcvIngestor(["SPY", "BIL"], max_bars=12, compact=compact)
+        for n in range(1, len(ohlcv) + 1):
+            panel = ingestor.update(ohlcv[:n])
+            full = OhlcvPanel.from_ohlcv(ohlcv[:n], compact=compact)
+            start = panel.start
+            # A bounded panel keeps at least the last max_bars bars.
+            assert start + len(panel) == n
+            assert len(panel) >= min(n, 12)
+            assert list(panel.dates) == list(full.dates)[start:]
+            assert len(ingestor.dates) == len(panel)
+            np.testing.assert_array_equal(panel.values, full.values[:, start:])
+            np.testing.assert_array_equal(panel.valid(), full.valid()[start:])
+            np.testing.assert_array_equal(panel.last_valid(), np.maximum(full.last_valid()[start:] - start, -1))
+        assert ingestor.rebuilds == 1
+        assert panel.start > 0
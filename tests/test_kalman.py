@@ -0,0 +1,80 @@
+import numpy as np
+
+from shared import KalmanBank, OhlcvIngestor, estimate_kalman, kalman_filter
+from shared.kalman import _DIFFUSE
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["BTC", "ETH"]
+
+
+def _reference(values, level_variance, trend_variance, observation_variance):
+    """Textbook matrix Kalman filter; a missing observation skips the step."""
+    trend = trend_variance is not None
+    F = np.array([[1.0, 1.0], [0.0, 1.0]]) if trend else np.eye(1)
+    Q = np.diag([level_variance, trend_variance]) if trend else np.array([[level_variance]])
+    H = np.eye(1, len(F))
+    R = observation_variance
+    x = P = None
+    levels, trends = [], []
+    for y in values:
+        if not np.isnan(y):
+            if x is None:
+                x = np.array([y, 0.0])[:len(F)]
+                P = np.diag([R, _DIFFUSE * (R + level_variance + trend_variance)])[:len(F), :len(F)] if trend \
+                    else np.array([[R]])
+            else:
+                x = F @ x
+                P = F @ P @ F.T + Q
+                S = H @ P @ H.T + R
+                K = P @ H.T / S
+                x = x + (K * (y - H @ x)).ravel()
+                P = (np.eye(len(F)) - K @ H) @ P
+        levels.append(np.nan if x is None else x[0])
+        trends.append(x[1] if x is not None and trend else 0.0)
+    return np.array(levels), np.array(trends)
+
+
+def _ohlcv():
+    ohlcv = daily_ohlcv(TICKERS, 250, seed=11)
+    for row in list(range(20)) + [100, 101, 102]:
+        del ohlcv[row]["ETH"]
+    return ohlcv
+
+
+def test_bank_matches_matrix_filter_bar_by_bar():
+    ohlcv = _ohlcv()
+    closes = {t: np.array([bar[t]["close"] if t in bar else np.nan for bar in ohlcv]) for t in TICKERS}
+    configs = [
+        dict(level_variance={"BTC": 0.5, "ETH": 0.02}, trend_variance=1e-3, observation_variance={"BTC": 4.0, "ETH": 0.1}),
+        dict(level_variance=1e-4, trend_variance=None, observation_variance=1e-3, log=True),
+    ]
+    for config in configs:
+        log = config.pop("log", False)
+        ingestor = OhlcvIngestor(TICKERS)
+        bank = ingestor.subscribe(KalmanBank(TICKERS, log=log, **config))
+        expected = {}
+        for t in TICKERS:
+            params = [value[t] if isinstance(value, dict) else value for value in config.values()]
+            level, trend = _reference(np.log(closes[t]) if log else closes[t], *params)
+            expected[t] = (np.exp(level) if log else level, trend)
+        for n in range(1, len(ohlcv) + 1):
+            ingestor.update(ohlcv[:n])
+            for t in TICKERS:
+                level, trend = expected[t]
+                np.testing.assert_allclose(bank.level(t), level[n - 1], rtol=1e-11)
+                np.testing.assert_allclose(bank.trend(t), trend[n - 1], rtol=1e-11, atol=1e-11)
+        batch = kalman_filter(np.column_stack([closes[t] for t in TICKERS]), log=log,
+                              **{k: np.array([v[t] for t in TICKERS]) if isinstance(v, dict) else v
+                                 for k, v in config.items()})
+        np.testing.assert_array_equal(batch["level"][-1], bank.level())
+        assert set(bank.as_dict(bank.level())) == set(TICKERS)
+
+
+def test_estimate_recovers_variances_of_simulated_series():
+    rng = np.random.default_rng(0)
+    level = 100 + np.cumsum(rng.normal(0, 0.3, 3000))
+    observed = level + rng.normal(0, 1.0, 3000)
+    params = estimate_kalman(observed, trend=False)
+    assert params["trend_variance"] is None
+    assert 0.05 < params["level_variance"] < 0.2
+    assert 0.7 < params["observation_variance"] < 1.3
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from shared.kernels import PrefixSums, RowBuffer
+
+
+def test_prefix_sums_match_rolling_mean_while_bounded():
+    rng = np.random.default_rng(1)
+    values = rng.normal(100, 5, (700, 2))
+    values[::41, 0] = np.nan
+    sums = PrefixSums((2,), max_length=30, capacity=16)
+    for start in range(0, len(values), 25):
+        sums.extend(values[start:start + 25])
+        assert len(sums) <= 30 + 25 and sums.start + len(sums) == min(start + 25, len(values))
+        expected = pd.DataFrame(values[:start + 25]).rolling(20).mean().to_numpy()
+        np.testing.assert_allclose(sums.mean(len(sums), 20), expected[-1], rtol=1e-12)
+        np.testing.assert_allclose(sums.mean(len(sums) - 3, 20), expected[-4], rtol=1e-12)
+    assert np.isnan(sums.mean(len(sums), 0)).all()
+    assert np.isnan(sums.sum(len(sums), len(sums) + 1)).all()
+
+
+def test_row_buffer_keeps_newest_rows():
+    buffer = RowBuffer(max_length=3, capacity=4)
+    for value in range(10):
+        buffer.append(value)
+    assert buffer.values[-3:].tolist() == [7.0, 8.0, 9.0]
+    assert buffer.start + len(buffer) == 10
+    buffer.extend(np.arange(10.0, 20.0))
+    assert buffer.values.tolist() == [17.0, 18.0, 19.0] and buffer.start == 17
@@ -0,0 +1,42 @@
+import copy
+
+import numpy as np
+
+from shared import AccessStats, LazyPanel, OhlcvPanel
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "BIL", "QQQ", "GLD"]
+
+
+def test_only_read_tickers_are_parsed():
+    ohlcv = daily_ohlcv(TICKERS, 60, seed=7)
+    for row in range(20, 25):
+        del ohlcv[row]["QQQ"]
+    full = OhlcvPanel.from_ohlcv(ohlcv)
+    stats = AccessStats()
+    lazy = LazyPanel(stats=stats)
+    for n in range(1, len(ohlcv) + 1):
+        lazy.update(ohlcv[:n])
+        np.testing.assert_array_equal(lazy.close("SPY"), full.close("SPY")[:n])
+        if n >= 30:
+            np.testing.assert_array_equal(lazy.high("QQQ"), full.high("QQQ")[:n])
+            np.testing.assert_array_equal(lazy.valid("QQQ"), full.valid("QQQ")[:n])
+    assert sorted(lazy.materialized) == ["QQQ", "SPY"]
+    assert stats.untouched(TICKERS) == ["BIL", "GLD"]
+    assert stats.bars == 60
+    assert stats.summary()["SPY"] == {"reads": 60, "bars": 60, "first_bar": 1, "last_bar": 60}
+    assert stats.summary()["QQQ"] == {"reads": 62, "bars": 31, "first_bar": 30, "last_bar": 60}
+
+
+def test_rewritten_history_is_parsed_again():
+    ohlcv = daily_ohlcv(TICKERS, 30, seed=7)
+    lazy = LazyPanel()
+    lazy.update(ohlcv)
+    assert lazy.close("SPY")[-1] == ohlcv[-1]["SPY"]["close"]
+    adjusted = copy.deepcopy(ohlcv)
+    for bar in adjusted:
+        bar["SPY"]["close"] *= 2
+    lazy.update(adjusted)
+    np.testing.assert_array_equal(lazy.close("SPY"), [bar["SPY"]["close"] for bar in adjusted])
+    lazy.update(adjusted[:10])
+    assert len(lazy.close("SPY")) == 10
@@ -0,0 +1,67 @@
+import copy
+
+from shared import IndicatorCache
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "QQQ"]
+
+
+def _counting(calls):
+    def RSI(ticker, data, length=14, field="close"):
+        calls.append((ticker, len(data), length))
+        return sum(bar[ticker][field] for bar in data[-length:]) / length
+    return RSI
+
+
+def test_hits_misses_and_argument_forms_share_a_key():
+    ohlcv = daily_ohlcv(TICKERS, 40, seed=12)
+    calls = []
+    cache = IndicatorCache()
+    rsi = cache.wrap(_counting(calls))
+    assert rsi.__name__ == "RSI"
+    first = rsi("SPY", ohlcv, 14)
+    assert rsi("SPY", ohlcv, length=14) == rsi("SPY", ohlcv) == first
+    rsi("QQQ", ohlcv, 14)
+    rsi("SPY", ohlcv, 10)
+    assert calls == [("SPY", 40, 14), ("QQQ", 40, 14), ("SPY", 40, 10)]
+    assert (cache.hits, cache.misses, len(cache)) == (2, 3, 3)
+    assert cache.summary() == {"RSI": {"hits": 2, "misses": 3}}
+
+
+def test_history_fingerprint_keeps_slices_apart():
+    ohlcv = daily_ohlcv(TICKERS, 40, seed=12)
+    calls = []
+    cache = IndicatorCache()
+    rsi = cache.wrap(_counting(calls))
+    rsi("SPY", ohlcv, 14)
+    rsi("SPY", ohlcv[1:], 14)
+    rsi("SPY", ohlcv[:-1], 14)
+    assert cache.misses == 3 and cache.hits == 0
+    # A rewritten newest close on the same bar is a different history.
+    adjusted = copy.deepcopy(ohlcv)
+    adjusted[-1]["SPY"]["close"] += 1.0
+    assert rsi("SPY", adjusted, 14) != rsi("SPY", ohlcv, 14)
+    assert cache.misses == 4 and cache.hits == 1
+    assert len(calls) == 4
+    # An empty history is passed straight through.
+    assert rsi("SPY", [], 14) == rsi("SPY", [], 14) == 0
+    assert len(calls) == 6 and cache.misses == 4
+
+
+def test_a_later_bar_empties_the_cache():
+    ohlcv = daily_ohlcv(TICKERS, 40, seed=12)
+    calls = []
+    cache = IndicatorCache()
+    rsi = cache.wrap(_counting(calls))
+    for n in range(20, 41):
+        rsi("SPY", ohlcv[:n], 14)
+        rsi("SPY", ohlcv[:n], 14)
+        rsi("QQQ", ohlcv[:n], 14)
+        assert len(cache) == 2
+        assert cache.bar == ohlcv[n - 1]["SPY"]["date"]
+    assert (cache.hits, cache.misses, cache.evictions) == (21, 42, 20)
+    # Looking back at an earlier bar does not evict the current one.
+    rsi("SPY", ohlcv[:30], 14)
+    assert len(cache) == 3 and cache.bar == ohlcv[-1]["SPY"]["date"]
+    cache.clear()
+    assert len(cache) == 0 and cache.evictions == 21
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from shared import OhlcvPanel
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "BIL", "QQQ"]
+
+
+def _ohlcv():
+    """QQQ is listed after 10 bars and misses bars 40 to 44."""
+    ohlcv = daily_ohlcv(TICKERS, 120, seed=1)
+    for row in list(range(10)) + list(range(40, 45)):
+        del ohlcv[row]["QQQ"]
+    return ohlcv
+
+
+def test_columns_match_list_of_dicts():
+    ohlcv = _ohlcv()
+    panel = OhlcvPanel.from_ohlcv(ohlcv)
+    assert panel.tickers == TICKERS and len(panel) == len(ohlcv)
+    for ticker in TICKERS:
+        for field in ("open", "high", "low", "close", "volume"):
+            expected = [bar[ticker][field] if ticker in bar else np.nan for bar in ohlcv]
+            np.testing.assert_array_equal(panel.column(ticker, field), expected)
+    assert panel.dates == [bar["SPY"]["date"] for bar in ohlcv]
+    assert np.shares_memory(panel.close("SPY"), panel.values)
+    assert np.shares_memory(panel.field("close"), panel.values)
+    np.testing.assert_array_equal(panel.field("close")[:, 2], panel.close("QQQ"))
+    assert [dict(bar) for bar in panel.ohlcv()] == ohlcv
+    assert [dict(bar) for bar in panel.ohlcv(["QQQ"], stop=12)] == [
+        {"QQQ": bar["QQQ"]} if "QQQ" in bar else {} for bar in ohlcv[:12]]
+
+
+def test_appends_and_bounded_window():
+    ohlcv = _ohlcv()
+    panel = OhlcvPanel(TICKERS, capacity=4)
+    bounded = OhlcvPanel(TICKERS, max_bars=25)
+    for n, bar in enumerate(ohlcv, 1):
+        panel.append(bar)
+        bounded.append(bar)
+        assert bounded.start + len(bounded) == n
+        assert 25 <= len(bounded) <= 50 or len(bounded) == n
+        np.testing.assert_array_equal(bounded.values, panel.values[:, bounded.start:])
+        assert bounded.dates == panel.dates[bounded.start:]
+    np.testing.assert_array_equal(panel.values, OhlcvPanel.from_ohlcv(ohlcv).values)
+    assert panel.bars_total == bounded.bars_total == len(ohlcv)
+    bounded.extend(ohlcv[:60])
+    assert len(bounded) == 25 and bounded.dates == panel.dates[35:60]
+    panel.clear()
+    assert len(panel) == 0 and panel.start == 0
+
+
+def test_validity_and_carried_values_match_pandas():
+    ohlcv = _ohlcv()
+    closes = pd.DataFrame([{t: bar[t]["close"] for t in bar} for bar in ohlcv], columns=TICKERS)
+    filled = closes.ffill()
+    for panel in (OhlcvPanel.from_ohlcv(ohlcv), OhlcvPanel.from_ohlcv(ohlcv, compact=True)):
+        np.testing.assert_array_equal(panel.valid(), closes.notna().to_numpy())
+        assert [panel.first_valid_index(t) for t in TICKERS] == [0, 0, 10]
+        assert panel.last_valid("QQQ")[9] == -1 and panel.last_valid("QQQ")[44] == 39
+        assert not panel.is_valid("QQQ", 42) and panel.is_valid("QQQ", 45)
+        np.testing.assert_allclose(panel.ffill(), filled.to_numpy(), rtol=1e-7)
+        for bars_ago in (0, 1, 63, 77, 109, 110, 119, 120):
+            row = len(ohlcv) - 1 - bars_ago
+            for t in TICKERS:
+                expected = filled[t].iloc[row] if row >= 0 else np.nan
+                np.testing.assert_allclose(panel.value_at(t, bars_ago), expected, rtol=1e-7)
+        assert panel.value_at("QQQ", 77, field="volume") == np.float32(ohlcv[39]["QQQ"]["volume"])
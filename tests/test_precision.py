@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from shared import HistoryStore, OhlcvPanel
+from shared.dates import MinuteDates
+from shared.precision import TOLERANCE, compare_allocations
+from tests.helpers import daily_ohlcv
+
+LOOKBACK = 20
+
+
+def _closes(data, ticker):
+    return np.array([bar[ticker]["close"] for bar in data["ohlcv"][-LOOKBACK - 1:]])
+
+
+class _CrossStrategy:
+    """All in SPY while its close is above its 20-bar mean, else all in BIL."""
+
+    assets = ["SPY", "BIL"]
+    interval = "1day"
+
+    def run(self, data):
+        if len(data["ohlcv"]) <= LOOKBACK:
+            return None
+        closes = _closes(data, "SPY")
+        return {"SPY": 1.0, "BIL": 0.0} if closes[-1] > closes[1:].mean() else {"SPY": 0.0, "BIL": 1.0}
+
+
+def _deviation(closes):
+    return np.std(np.diff(closes) / closes[:-1], ddof=1)
+
+
+class _InverseVolStrategy:
+    """Weights inversely proportional to 20-bar return deviations."""
+
+    assets = ["SPY", "BIL"]
+    interval = "1day"
+
+    def run(self, data):
+        if len(data["ohlcv"]) <= LOOKBACK:
+            return None
+        inverse = {ticker: 1 / _deviation(_closes(data, ticker)) for ticker in self.assets}
+        total = sum(inverse.values())
+        return {ticker: x / total for ticker, x in inverse.items()}
+
+
+@pytest.fixture(scope="module")
+def ohlcv():
+    return daily_ohlcv(["SPY", "BIL"], 120, seed=5)
+
+
+@pytest.fixture
+def store(tmp_path, ohlcv):
+    return HistoryStore.write(str(tmp_path / "float64"), ohlcv)
+
+
+def test_compact_allocations_agree_within_the_contract(store, ohlcv):
+    assert compare_allocations(_CrossStrategy, store) == []
+    assert compare_allocations(_InverseVolStrategy, store) == []
+    assert compare_allocations(_InverseVolStrategy, store, tolerance=TOLERANCE / 100) == []
+
+    closes = np.array([bar["BIL"]["close"] for bar in ohlcv])
+    sigma = min(_deviation(closes[n - LOOKBACK - 1:n]) for n in range(LOOKBACK + 1, len(closes) + 1))
+    differences = compare_allocations(_InverseVolStrategy, store, tolerance=0)
+    assert differences
+    assert max(d for _, d in differences) <= 2 ** -23 / sigma
+
+
+def test_float32_store_replays_identically(tmp_path, ohlcv):
+    store = HistoryStore.write(str(tmp_path / "float32"), ohlcv, dtype=np.float32)
+    assert compare_allocations(_InverseVolStrategy, store, tolerance=0) == []
+    assert compare_allocations(_CrossStrategy, store, start=30, stop=90, tolerance=0) == []
+
+
+def test_minute_dates_round_trip():
+    dates = ["2020-01-02 09:30:00", "2020-01-02 09:31:45", "2020-02-29 16:00:00"]
+    minutes = MinuteDates(dates)
+    assert list(minutes) == ["2020-01-02 09:30:00", "2020-01-02 09:31:00", "2020-02-29 16:00:00"]
+    assert minutes[-1] == minutes[2] == "2020-02-29 16:00:00"
+    assert minutes[1:] == ["2020-01-02 09:31:00", "2020-02-29 16:00:00"]
+
+    minutes.extend("2020-03-%02d 00:00:00" % day for day in range(1, 21))
+    minutes.append("2020-03-21 00:00:00")
+    assert len(minutes) == 24
+    assert minutes.minutes.dtype == np.int32
+    minutes[-1] = "2040-12-31 23:59:59"
+    del minutes[0]
+    assert minutes[0] == "2020-01-02 09:31:00"
+    assert minutes[-1] == "2040-12-31 23:59:00"
+    assert len(minutes) == 23
+
+
+def test_from_arrays_compact_round_trip(store, ohlcv):
+    values = np.stack([store.array(ticker) for ticker in store.tickers]).copy()
+    values[1, :7, :] = np.nan
+    values[0, 50, :] = np.nan
+    dates = list(store.dates)
+    panel = OhlcvPanel.from_arrays(store.tickers, values, dates, compact=True)
+
+    assert panel.values.dtype == np.float32
+    assert isinstance(panel.dates, MinuteDates)
+    assert list(panel.dates) == dates
+    assert panel.valid("BIL").tolist() == [False] * 7 + [True] * 113
+    assert panel.first_valid_index("BIL") == 7
+    assert panel.first_valid_index("SPY") == 0
+    assert panel.last_valid("SPY")[50] == 49
+    np.testing.assert_array_equal(panel.close("SPY"), values[0, :, 3].astype(np.float32))
+
+    assert np.array_equal(store.to_panel(compact=True).values, OhlcvPanel.from_ohlcv(ohlcv, compact=True).values)
+    assert list(store.to_panel(compact=True).dates) == dates
+
+    bounded = OhlcvPanel.from_arrays(store.tickers, values, dates, max_bars=30, compact=True)
+    assert bounded.start == 90
+    assert list(bounded.dates) == dates[-30:]
+    np.testing.assert_array_equal(bounded.close("SPY"), panel.close("SPY")[-30:])
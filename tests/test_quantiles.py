@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from shared import RollingQuantile
+
+QUANTILES = [0.0, 0.1, 0.35, 0.5, 0.55, 0.65, 0.8, 0.999, 1.0]
+
+
+def test_matches_np_percentile_over_3000_bars():
+    rng = np.random.default_rng(16)
+    values = np.round(rng.normal(0, 1, 3000), 2)
+    rolling = RollingQuantile(512)
+    expanding = RollingQuantile(None)
+    for n, x in enumerate(values, 1):
+        rolling.update(x)
+        expanding.update(x)
+        if n % 7 and n != len(values):
+            continue
+        np.testing.assert_array_equal(rolling.quantile(QUANTILES), np.quantile(values[max(n - 512, 0):n], QUANTILES))
+        np.testing.assert_array_equal(expanding.percentile([55, 80]), np.percentile(values[:n], [55, 80]))
+    assert len(rolling) == 512
+    assert expanding.quantile(0.5) == np.median(values)
+
+
+def test_nan_handling_and_reset():
+    values = [3.0, np.nan, 1.0, 2.0, 5.0]
+    window = RollingQuantile(3).extend(values[:3])
+    assert np.isnan(window.quantile(0.5))
+    assert RollingQuantile(3, skipna=True).extend(values[:3]).quantile(0.5) == pd.Series(values[:3]).quantile(0.5)
+    window.extend(values[3:])
+    assert window.nans == 0
+    assert window.quantile(0.5) == 2.0
+    window.reset()
+    assert len(window) == 0 and np.isnan(window.quantile(0.5))
@@ -0,0 +1,53 @@
+import numpy as np
+
+from shared import OhlcvIngestor, RegressionBank
+from tests.helpers import daily_ohlcv, flat_ohlcv
+
+
+def test_window_watched_after_subscribing_matches_one_watched_from_the_start():
+    ohlcv = daily_ohlcv(["A", "B"], 120, seed=4)
+    late = RegressionBank(["A", "B"])
+    early = RegressionBank(["A", "B"], windows=(20,))
+    ingestor = OhlcvIngestor(["A", "B"])
+    ingestor.subscribe(late)
+    ingestor.subscribe(early)
+    ingestor.update(ohlcv[:90])
+    late.watch(20)
+    np.testing.assert_array_equal(late.slope(20), early.slope(20))
+    ingestor.update(ohlcv)
+    np.testing.assert_array_equal(late.slope(20), early.slope(20))
+    np.testing.assert_array_equal(late.r2(20), early.r2(20))
+
+
+def test_exact_polynomials_and_polyfit():
+    bars = np.arange(300.0)
+    lines = {"LINE": 3.0 + 0.5 * bars, "PARABOLA": 40.0 - 0.75 * bars + 0.125 * bars ** 2}
+    noisy = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, len(bars)))
+    ohlcv = flat_ohlcv(lines["LINE"], "LINE")
+    for ticker, closes in (("PARABOLA", lines["PARABOLA"]), ("NOISY", noisy)):
+        for bar, close in zip(ohlcv, closes):
+            bar[ticker] = dict(bar["LINE"], open=close, high=close, low=close, close=close)
+    del ohlcv[250]["NOISY"]
+    tickers = ["LINE", "PARABOLA", "NOISY"]
+    ingestor = OhlcvIngestor(tickers)
+    bank = ingestor.subscribe(RegressionBank(tickers, windows=(15, 110)))
+    for n in range(1, len(ohlcv) + 1):
+        ingestor.update(ohlcv[:n])
+        for length in (15, 110):
+            if n < length:
+                assert np.isnan(bank.slope(length)).all()
+                continue
+            assert abs(bank.slope(length, "LINE") - 0.5) < 1e-13
+            assert abs(bank.intercept(length, "LINE") - lines["LINE"][n - length]) < 1e-10
+            assert abs(bank.r2(length, "LINE") - 1.0) < 1e-13
+            assert abs(bank.curvature(length, "LINE")) < 1e-13
+            assert abs(bank.curvature(length, "PARABOLA") - 0.25) < 1e-11
+            window = noisy[n - length:n]
+            if n - length <= 250 < n:
+                assert np.isnan(bank.slope(length, "NOISY"))
+            else:
+                slope = np.polyfit(np.arange(length), window, 1)[0]
+                curvature = 2 * np.polyfit(np.arange(length), window, 2)[0]
+                assert abs(bank.slope(length, "NOISY") - slope) < 1e-10 * max(abs(slope), 1)
+                assert abs(bank.curvature(length, "NOISY") - curvature) < 1e-10
+    assert set(bank.as_dict(bank.slope(15))) == set(tickers)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from shared import OhlcvIngestor, ReturnsBank
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "BIL", "QQQ"]
+HORIZONS = [1, 21, 63, 126]
+
+
+def _ohlcv():
+    """QQQ is listed after 40 bars and misses a few later ones."""
+    ohlcv = daily_ohlcv(TICKERS, 300, seed=2)
+    for row in list(range(40)) + [150, 151, 299]:
+        del ohlcv[row]["QQQ"]
+    return ohlcv
+
+
+def _prices(ohlcv):
+    """Forward-filled closes as a DataFrame, one column per ticker."""
+    return pd.DataFrame([{t: bar[t]["close"] for t in bar} for bar in ohlcv], columns=TICKERS).ffill()
+
+
+def test_returns_match_pandas_every_bar():
+    ohlcv = _ohlcv()
+    ingestor = OhlcvIngestor(TICKERS)
+    bank = ingestor.subscribe(ReturnsBank(TICKERS + ["GLD"]))
+    prices = _prices(ohlcv)
+    expected = {h: prices.pct_change(h, fill_method=None).to_numpy() for h in HORIZONS}
+    for n in range(1, len(ohlcv) + 1):
+        ingestor.update(ohlcv[:n])
+        matrix = bank.returns(HORIZONS)
+        assert matrix.shape == (4, len(HORIZONS))
+        assert np.isnan(matrix[3]).all()
+        for j, h in enumerate(HORIZONS):
+            np.testing.assert_allclose(matrix[:3, j], expected[h][n - 1], rtol=1e-12, atol=1e-15)
+
+    weights = {21: 0.35, 63: 0.35, 126: 0.30}
+    composite = sum(w * expected[h][-1] for h, w in weights.items())
+    np.testing.assert_allclose(bank.composite(weights)[:3], composite, rtol=1e-12, atol=1e-15)
+    np.testing.assert_allclose(bank.returns(21, bars_ago=5)[:3, 0], expected[21][-6], rtol=1e-12)
+    scores = bank.as_dict(bank.composite(weights, fill=0.0))
+    assert list(scores) == TICKERS + ["GLD"] and scores["GLD"] == 0.0
+
+
+def test_bounded_bank_follows_bounded_panel():
+    ohlcv = _ohlcv()
+    full = OhlcvIngestor(TICKERS)
+    bounded = OhlcvIngestor(TICKERS, max_bars=130)
+    reference = full.subscribe(ReturnsBank())
+    bank = bounded.subscribe(ReturnsBank(max_horizon=126))
+    for n in range(1, len(ohlcv) + 1):
+        full.update(ohlcv[:n])
+        bounded.update(ohlcv[:n])
+        np.testing.assert_allclose(bank.returns(HORIZONS), reference.returns(HORIZONS), rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(bank.returns(400, clamp=True), bank.returns(len(bank) - 1))
+    assert bank.start > 0
+    assert len(bank) <= 2 * 127
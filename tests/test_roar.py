@@ -0,0 +1,21 @@
+import importlib.util
+import os
+
+from shared.roar import compare_with_strategy
+from tests.helpers import daily_ohlcv
+
+STRATEGY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "20e28c47-1173-408a-98c5-5a877173edf3", "main.py")
+
+
+def _load_strategy():
+    spec = importlib.util.spec_from_file_location("roar_strategy", STRATEGY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.TradingStrategy
+
+
+def test_engine_replays_strategy(surmount):
+    # twenty years of weekdays: rebalances, warm-up and the 512-bar quantile windows all roll over many times
+    ohlcv = daily_ohlcv(["SPY", "BIL"], 20 * 261, seed=7)
+    assert compare_with_strategy(_load_strategy()(), ohlcv) == []
@@ -0,0 +1,106 @@
+import numpy as np
+
+from shared import BookRunner, OhlcvPanel, RollingQuantile, RunningMax, SeriesAggregate
+from tests.helpers import daily_ohlcv
+
+
+class _PeakStrategy:
+    assets = ["SPY"]
+    interval = "1day"
+    max_lookback = 5
+
+    def __init__(self):
+        self.aggregates = {"peak": RunningMax("SPY")}
+
+    def run(self, data):
+        return len(data["ohlcv"]), data["ohlcv"][-1]["SPY"]["close"], data["aggregates"]["peak"]
+
+
+def _realized_vol(closes):
+    returns = np.log(closes[1:] / closes[:-1])
+    return np.sqrt(np.sum(returns ** 2) / (len(returns) - 1))
+
+
+class _VolStrategy:
+    """Keeps only 61 bars but ranks today's 60-bar volatility against its whole history, as 43d0a63f does."""
+
+    assets = ["SPY", "BIL"]
+    interval = "1day"
+    max_lookback = 61
+
+    def __init__(self):
+        self.aggregates = {"vol": SeriesAggregate(RollingQuantile(None), _realized_vol, "SPY", window=61)}
+
+    def run(self, data):
+        return data["aggregates"]["vol"].percentile([55, 80])
+
+
+def _runner(strategy, ohlcv):
+    panel = OhlcvPanel.from_ohlcv(ohlcv)
+    return BookRunner([strategy], lambda interval, tickers: panel)
+
+
+def test_aggregates_restart_with_every_run():
+    ohlcv = daily_ohlcv(["SPY"], 80, seed=3)
+    closes = [bar["SPY"]["close"] for bar in ohlcv]
+    runner = _runner(_PeakStrategy(), ohlcv)
+    first = runner.run()[0]
+    assert runner.run()[0] == first
+    assert runner.run(start=10, stop=40)[0] == first[9:40]
+    for n, (length, close, peak) in enumerate(first, 1):
+        assert length == min(n, 5)
+        assert close == closes[n - 1]
+        assert peak == max(closes[:n])
+
+
+def test_series_aggregate_ranks_a_derived_series_over_the_whole_history():
+    ohlcv = daily_ohlcv(["SPY", "BIL"], 300, seed=8)
+    closes = np.array([bar["SPY"]["close"] for bar in ohlcv])
+    del ohlcv[100]["SPY"]
+    closes = np.delete(closes, 100)
+    results = _runner(_VolStrategy(), ohlcv).run()[0]
+    vols = [_realized_vol(closes[end - 61:end]) for end in range(61, len(closes) + 1)]
+    present = [n for n in range(1, len(ohlcv) + 1) if n != 101]
+    for rank, n in enumerate(present, 1):
+        expected = np.percentile(vols[:rank - 60], [55, 80]) if rank >= 61 else [np.nan, np.nan]
+        np.testing.assert_array_equal(results[n - 1], expected)
+
+
+class _Reader:
+    """Reads the first of its assets every bar; declares a dataset."""
+
+    data = [["median_cpi"]]
+
+    def __init__(self, assets, interval="1day"):
+        self.assets = assets
+        self.interval = interval
+
+    def run(self, data):
+        bar = data["ohlcv"][-1]
+        return sorted(bar), bar[self.assets[0]]["close"], data[("median_cpi",)]
+
+
+def test_universes_are_loaded_once_per_interval():
+    ohlcv = daily_ohlcv(["SPY", "BIL", "QQQ", "GLD"], 30, seed=5)
+    panel = OhlcvPanel.from_ohlcv(ohlcv)
+    loads = []
+
+    def loader(interval, tickers):
+        loads.append((interval, list(tickers)))
+        return panel
+
+    strategies = [_Reader(["SPY", "BIL"]), _Reader(["QQQ", "SPY"]), _Reader(["GLD"], interval="1week")]
+    runner = BookRunner(strategies, loader, data_loader=lambda key, date: (key, date))
+    assert runner.universes() == {"1day": ["SPY", "BIL", "QQQ"], "1week": ["GLD"]}
+    results = runner.run(start=5)
+    runner.run(start=5)
+    assert loads == [("1day", ["SPY", "BIL", "QQQ"]), ("1week", ["GLD"])]
+    for strategy, result in zip(strategies, results):
+        assert len(result) == 26
+        for n, (tickers, close, dataset) in enumerate(result, 5):
+            assert tickers == sorted(strategy.assets)
+            assert close == ohlcv[n - 1][strategy.assets[0]]["close"]
+            assert dataset == (("median_cpi",), ohlcv[n - 1]["SPY"]["date"])
+    assert runner.calls == [52, 52, 52]
+    assert runner.stats[0].untouched(strategies[0].assets) == ["BIL"]
+    assert runner.stats[1].summary()["QQQ"]["bars"] == 52
@@ -0,0 +1,49 @@
+import numpy as np
+
+from shared import HistoryStore, OhlcvPanel
+from tests.helpers import daily_ohlcv
+
+TICKERS = ["SPY", "BIL", "QQQ"]
+
+
+def _ohlcv():
+    ohlcv = daily_ohlcv(TICKERS, 90, seed=6)
+    for row in list(range(5)) + [50]:
+        del ohlcv[row]["QQQ"]
+    return ohlcv
+
+
+def test_store_round_trips_the_history(tmp_path):
+    ohlcv = _ohlcv()
+    HistoryStore.write(str(tmp_path), ohlcv)
+    store = HistoryStore(str(tmp_path))
+    assert store.tickers == TICKERS and len(store) == len(ohlcv)
+    assert isinstance(store.array("SPY"), np.memmap) and not store.array("SPY").flags.writeable
+    assert store.dates == [bar["SPY"]["date"] for bar in ohlcv]
+    assert store.date_at(7) == ohlcv[7]["SPY"]["date"]
+    np.testing.assert_array_equal(store.column("QQQ"), OhlcvPanel.from_ohlcv(ohlcv).close("QQQ"))
+    assert not store.is_valid("QQQ", 50) and store.is_valid("QQQ", 51)
+    assert [dict(bar) for bar in store.ohlcv()] == ohlcv
+    assert [dict(bar) for bar in store.ohlcv(["QQQ"], stop=6)] == [
+        {"QQQ": bar["QQQ"]} if "QQQ" in bar else {} for bar in ohlcv[:6]]
+
+
+def test_to_panel_matches_from_ohlcv(tmp_path):
+    ohlcv = _ohlcv()
+    store = HistoryStore.write(str(tmp_path), OhlcvPanel.from_ohlcv(ohlcv))
+    panel = store.to_panel(["QQQ", "SPY"], start=3, stop=60)
+    expected = OhlcvPanel.from_ohlcv(ohlcv[3:60], tickers=["QQQ", "SPY"])
+    np.testing.assert_array_equal(panel.values, expected.values)
+    np.testing.assert_array_equal(panel.valid(), expected.valid())
+    np.testing.assert_array_equal(panel.last_valid(), expected.last_valid())
+    assert panel.dates == expected.dates
+    assert store.to_panel(max_bars=20).start == 70
+
+
+def test_float32_store(tmp_path):
+    ohlcv = _ohlcv()
+    store = HistoryStore.write(str(tmp_path), ohlcv, dtype=np.float32)
+    assert store.dtype == np.float32 and store.array("BIL").dtype == np.float32
+    reopened = HistoryStore(str(tmp_path))
+    np.testing.assert_array_equal(reopened.column("BIL"), np.float32([bar["BIL"]["close"] for bar in ohlcv]))
+    assert reopened.to_panel().values.dtype == np.float32
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from shared import OhlcvIngestor
+from shared.streaming import HMA, MACD, PSAR, SMA, SO, WMA
+from tests.helpers import daily_ohlcv
+
+
+def _closes(ticker, ohlcv):
+    return np.array([bar[ticker]["close"] for bar in ohlcv if ticker in bar])
+
+
+def _sma(ticker, ohlcv, length):
+    closes = _closes(ticker, ohlcv)
+    return [closes[n - length:n].mean() if n >= length else float("nan") for n in range(1, len(closes) + 1)]
+
+
+def test_verify_through_ingestor(surmount):
+    surmount.technical_indicators.SMA = _sma
+    ohlcv = daily_ohlcv(["SPY"], 60)
+    ingestor = OhlcvIngestor(["SPY"])
+    sma = SMA("SPY", 5, verify=True)
+    ingestor.subscribe(sma)
+    for n in range(1, len(ohlcv) + 1):
+        ingestor.update(ohlcv[:n])
+    assert sma.value == pytest.approx(_closes("SPY", ohlcv)[-5:].mean())
+
+
+def test_verify_reports_mismatch(surmount):
+    surmount.technical_indicators.SMA = lambda ticker, ohlcv, length: _sma(ticker, ohlcv, length + 1)
+    ohlcv = daily_ohlcv(["SPY"], 20)
+    ingestor = OhlcvIngestor(["SPY"])
+    ingestor.subscribe(SMA("SPY", 5, verify=True))
+    with pytest.raises(AssertionError):
+        ingestor.update(ohlcv)
+
+
+def test_verify_rejects_parameters_batch_cannot_take():
+    with pytest.raises(ValueError):
+        SO("SPY", k=5, verify=True)
+    with pytest.raises(ValueError):
+        PSAR("SPY", max_af=0.3, verify=True)
+    with pytest.raises(ValueError):
+        MACD("SPY", signal=5, verify=True)
+    assert SO("SPY", k=5).k == 5
+    assert MACD("SPY", 15, 40, verify=True).params == {"fast": 15, "slow": 40}
+
+
+def test_verify_rejects_indicators_without_batch_function():
+    for indicator in (WMA, HMA):
+        with pytest.raises(ValueError):
+            indicator("SPY", 10, verify=True)
+        assert indicator("SPY", 10).verify is False
+
+
+def test_anchored_vwap_periods_from_any_date_form():
+    import datetime
+
+    from shared.dates import DateIndex
+    from shared.streaming import AnchoredVWAP, _period
+
+    dates = ["2019-12-31 00:00:00", "2020-01-02 00:00:00", "2020-03-31 00:00:00", "2020-04-01 00:00:00"]
+    index = DateIndex()
+    index.extend(dates)
+    assert [_period(date, "month") for date in dates] == index.month.tolist()
+    assert [_period(date, "quarter") for date in dates] == index.quarter.tolist()
+    assert _period(datetime.datetime(2020, 4, 1, 9, 30), "quarter") == index.quarter[-1]
+    assert _period(datetime.date(2019, 12, 31), "year") == 49
+
+    vwap = AnchoredVWAP("X")
+    for date, price in zip([datetime.datetime(2020, 3, 31), datetime.datetime(2020, 4, 1)], (1.0, 3.0)):
+        vwap.update({"high": price, "low": price, "close": price, "volume": 1.0, "date": date})
+    assert vwap.value == 3.0
+
+
+def test_anchored_vwap_from_ingestor_matches_candles():
+    from shared.streaming import AnchoredVWAP
+
+    ohlcv = daily_ohlcv(["SPY"], 200)
+    for anchor in ("month", "quarter", "year"):
+        expected = AnchoredVWAP("SPY", anchor)
+        ingestors = [OhlcvIngestor(["SPY"]), OhlcvIngestor(["SPY"], max_bars=30, compact=True)]
+        vwaps = [AnchoredVWAP("SPY", anchor) for _ in ingestors]
+        for ingestor, vwap in zip(ingestors, vwaps):
+            ingestor.subscribe(vwap)
+        for n in range(1, len(ohlcv) + 1):
+            expected.update(ohlcv[n - 1]["SPY"])
+            for ingestor, vwap in zip(ingestors, vwaps):
+                ingestor.update(ohlcv[:n])
+            assert vwaps[0].value == expected.value
+            assert vwaps[1].value == pytest.approx(expected.value, rel=1e-6)
+    with pytest.raises(ValueError):
+        AnchoredVWAP("SPY", verify=True)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from shared import OhlcvIngestor
+from shared.trading_calendar import every, month_day, month_end, nth_session, quarter_end, week_end, weekly
+from tests.helpers import weekdays
+
+HOLIDAYS = ["2000-01-17", "2000-02-21", "2000-03-31", "2000-04-21", "2000-05-29"]
+
+
+def _dates():
+    """Weekday bars without the holidays; a few days have a second, intraday bar."""
+    days = [str(day) for day in weekdays(130) if str(day) not in HOLIDAYS]
+    dates = []
+    for i, day in enumerate(days):
+        if i % 9 == 4:
+            dates.append(day + " 09:30:00")
+        dates.append(day + " 16:00:00")
+    return dates
+
+
+def _reference(dates):
+    """Calendar columns of ``dates`` computed with pandas, the next session projected past the last day."""
+    stamps = pd.to_datetime(pd.Series(dates)).dt.normalize()
+    sessions = pd.Series(stamps.unique())
+    projected = sessions.iloc[-1] + pd.offsets.CustomBusinessDay(holidays=HOLIDAYS)
+    following = pd.concat([sessions.iloc[1:], pd.Series([projected])], ignore_index=True)
+    following = stamps.map(dict(zip(sessions, following)))
+    columns = {}
+    for name, freq in (("week_end", "W"), ("month_end", "M"), ("quarter_end", "Q")):
+        columns[name] = (stamps.dt.to_period(freq) != following.dt.to_period(freq)).to_numpy()
+    columns["session_of_month"] = stamps.groupby(stamps.dt.to_period("M")).rank(method="dense").astype(int).to_numpy()
+    columns["weekday"] = stamps.dt.weekday.to_numpy()
+    first_after_15 = stamps.groupby(stamps.dt.to_period("M")).transform(lambda s: s[s.dt.day >= 15].min())
+    columns["first_after_15"] = (stamps == first_after_15).to_numpy()
+    return columns
+
+
+def _fired(columns, schedule):
+    rules = {
+        "week_end": columns["week_end"],
+        "month_end": columns["month_end"],
+        "quarter_end": columns["quarter_end"],
+        "month_day(15)": columns["first_after_15"],
+        "nth_session(1)": columns["session_of_month"] == 1,
+        "nth_session(3)": columns["session_of_month"] == 3,
+        "weekly(2)": columns["weekday"] == 2,
+        "every(5)": (np.arange(len(columns["weekday"])) + 1) % 5 == 0,
+    }
+    return np.flatnonzero(rules[schedule.name])
+
+
+def test_calendar_matches_pandas_bar_by_bar():
+    dates = _dates()
+    ohlcv = [{"SPY": {"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0, "date": date}}
+             for date in dates]
+    ingestor = OhlcvIngestor(["SPY"], holidays=HOLIDAYS)
+    calendar = ingestor.dates
+    schedules = [week_end(), month_end(), quarter_end(), nth_session(1), weekly(2), every(5)]
+    late = [month_day(15), nth_session(3)]
+    for n in range(1, len(ohlcv) + 1):
+        ingestor.update(ohlcv[:n])
+        if n == 1:
+            for schedule in schedules:
+                calendar.rebalance_indices(schedule)
+        if n == len(ohlcv) // 2:
+            schedules += late
+        expected = _reference(dates[:n])
+        for name in ("week_end", "month_end", "quarter_end", "session_of_month"):
+            np.testing.assert_array_equal(getattr(calendar, name), expected[name], err_msg="%s at %d" % (name, n))
+        for schedule in schedules:
+            np.testing.assert_array_equal(calendar.rebalance_indices(schedule), _fired(expected, schedule),
+                                          err_msg="%s at %d" % (schedule.name, n))
+            assert calendar.is_rebalance(schedule) == (n - 1 in _fired(expected, schedule))
+        assert calendar.is_nth_session(int(expected["session_of_month"][-1]))
+
+    # A new Schedule object with a registered name reuses the registration.
+    assert calendar.rebalance_indices(month_end()).tolist() == _fired(expected, month_end()).tolist()
+    assert len(calendar._schedules) == len(schedules)
+    # The last session before the 2000-03-31 holiday closes the month and the quarter.
+    last_march = max(i for i, date in enumerate(dates) if date.startswith("2000-03"))
+    assert calendar.month_end[last_march] and calendar.quarter_end[last_march]
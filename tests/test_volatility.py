@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared import OhlcvIngestor, VolatilityBank, inverse_volatility_weights
+from shared.volatility import RollingVolatility, log_returns, realized_volatility
+from tests.helpers import daily_ohlcv, flat_ohlcv
+
+
+def test_return_from_zero_close_is_nan():
+    bank = VolatilityBank(["X"]).watch(2).watch(2, "log_returns")
+    ingestor = OhlcvIngestor(["X"])
+    ingestor.subscribe(bank)
+    ingestor.update(flat_ohlcv([1.0, 0.0, 1.0]))
+    assert math.isnan(bank.std("X", 2))
+    ingestor.update(flat_ohlcv([1.0, 0.0, 1.0, 2.0, 3.0]))
+    assert bank.std("X", 2) == math.sqrt(((1.0 - 0.5) ** 2) / 2)
+    assert bank.std("X", 2, "log_returns") > 0
+
+
+def test_window_watched_after_subscribing_matches_one_watched_from_the_start():
+    ohlcv = daily_ohlcv(["A", "B"], 200, seed=6)
+    keys = [(20, "returns"), (None, "log_returns"), (10, "close", 0)]
+    late = VolatilityBank(["A", "B"])
+    early = VolatilityBank(["A", "B"], windows=keys)
+    ingestor = OhlcvIngestor(["A", "B"])
+    ingestor.subscribe(late)
+    ingestor.subscribe(early)
+    ingestor.update(ohlcv[:150])
+    for key in keys:
+        late.watch(*key)
+    ingestor.update(ohlcv)
+    for key in keys:
+        assert late.volatilities(["A", "B"], *key) == early.volatilities(["A", "B"], *key)
+
+
+def _realized_volatility_daily(returns):
+    return np.sqrt(np.sum(returns ** 2) / (len(returns) - 1))
+
+
+def test_realized_volatility_matches_rolling_apply():
+    closes = np.array([bar["A"]["close"] for bar in daily_ohlcv(["A"], 300, seed=15)])
+    returns = pd.Series(np.log(closes / np.roll(closes, 1))).fillna(0)
+    returns.iloc[0] = 0.0
+    np.testing.assert_allclose(log_returns(closes), returns.to_numpy(), rtol=1e-15)
+    for window, shift in ((21, 0), (63, 5)):
+        shifted = returns.shift(shift).fillna(0)
+        expected = shifted.rolling(window).apply(_realized_volatility_daily, raw=True).to_numpy()
+        np.testing.assert_array_equal(realized_volatility(returns, window, shift, exact=True), expected)
+        np.testing.assert_allclose(realized_volatility(returns, window, shift), expected, rtol=1e-12)
+        rolling = RollingVolatility(window, shift)
+        np.testing.assert_allclose([rolling.update(close) for close in closes], expected, rtol=1e-12)
+    block = np.column_stack([returns, returns * 2])
+    np.testing.assert_allclose(realized_volatility(block, 21)[:, 1], 2 * realized_volatility(returns, 21), rtol=1e-12)
+
+
+def test_inverse_volatility_weights():
+    weights = inverse_volatility_weights({"A": 0.1, "B": 0.2, "C": 0.4})
+    assert weights == pytest.approx({"A": 4 / 7, "B": 2 / 7, "C": 1 / 7})
+    assert inverse_volatility_weights({"A": 0.001, "B": 0.02}, floor=0.01) == pytest.approx({"A": 2 / 3, "B": 1 / 3})
+    assert inverse_volatility_weights({"A": 0.1, "B": math.nan, "C": 0.0}) == pytest.approx({"A": 1.0})
+    assert inverse_volatility_weights({"A": 0.1, "B": None}, default=0.1) == pytest.approx({"A": 0.5, "B": 0.5})
+    assert inverse_volatility_weights({"A": math.nan, "B": math.inf}) == {"A": 0.5, "B": 0.5}
+    assert inverse_volatility_weights({}) == {}